@@ -179,6 +179,8 @@ thermalmodel = tm.ThermalModel(
     simulation_duration=0.1666 * 60,  # seconds
     timestep=1,  # seconds
     model_description=model_description,
+    # the placeholder links are far too conductive for forward Euler at a 1 s timestep
+    integrator='backward-euler',
 )
 
 thermalmodel.display()
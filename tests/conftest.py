@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+import copy
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import thermalmodel.links as links  # noqa: E402
+from thermalmodel.environment import OrbitEnvironment  # noqa: E402
+from thermalmodel.timeseries import TimeSeries  # noqa: E402
+
+# three HSN of a small satellite, using every link type the engine compiles
+MODEL_DESCRIPTION = [
+    (
+        'Battery',
+        {
+            'mass': 0.3,
+            'heatCapacity': 900,
+            'heatGeneration': 1.5,
+            'temperature': 293.15,
+        },
+        [
+            ('BAT-top', { 'emissivity': 0.8, 'absorptivity': 0.6, 'area': 0.01, 'sunAccess': 1, 'spaceAccess': 1 }, []),
+            ('BAT-bottom', { 'emissivity': 0.8, 'absorptivity': 0.6 }, []),
+        ],
+    ),
+    (
+        'Board',
+        {
+            'mass': 0.1,
+            'heatCapacity': 887,
+            'heatGeneration': 0.5,
+            'temperature': 300.15,
+        },
+        [
+            (
+                'BC-bottom',
+                { 'emissivity': 0.9, 'absorptivity': 0.5 },
+                [
+                    (
+                        'BC-BAT', ('Battery', 'BAT-top'),
+                        [ links.ContactLink, links.ConductionLink ],
+                        { 'contactArea': 1e-3, 'resistance': 0.05, 'conductionArea': 1e-4, 'conductivity': 237, 'length': 0.05 },
+                    ),
+                ],
+            ),
+            ('BC-side', { 'emissivity': 0.85, 'absorptivity': 0.5, 'area': 0.005, 'earthAccess': 0.3, 'spaceAccess': 0.7 }, []),
+        ],
+    ),
+    (
+        'Panel',
+        {
+            'mass': 0.2,
+            'heatCapacity': 887,
+            'temperature': 280.15,
+        },
+        [
+            (
+                'P-inner',
+                { 'emissivity': 0.7, 'absorptivity': 0.4 },
+                [
+                    (
+                        'P-BC', ('Board', 'BC-side'),
+                        [ links.RadiationLink ],
+                        { 'radiationArea1': 0.02, 'radiationArea2': 0.01, 'viewingFactor': 0.5 },
+                    ),
+                    (
+                        'P-BAT', ('Battery', 'BAT-bottom'),
+                        [ links.ConductionLink, links.RadiationLink ],
+                        { 'conductionArea': 5e-5, 'conductivity': 398, 'length': 0.1, 'radiationArea1': 0.01, 'radiationArea2': 0.01, 'viewingFactor': 0.3 },
+                    ),
+                ],
+            ),
+            ('P-outer', { 'emissivity': 0.9, 'absorptivity': 0.9, 'area': 0.02, 'sunAccess': 1, 'earthAccess': 0.5, 'spaceAccess': 1 }, []),
+        ],
+    ),
+]
+
+HSN_NAMES = [ nameHSN for nameHSN, _, _ in MODEL_DESCRIPTION ]
+
+
+@pytest.fixture
+def model_description():
+    """A fresh copy of `MODEL_DESCRIPTION`, which building a model modifies."""
+    return copy.deepcopy(MODEL_DESCRIPTION)
+
+
+@pytest.fixture
+def environment():
+    """Ten minutes in the sun followed by an eclipse, sampled every second."""
+    elevation = np.concatenate((np.linspace(10, 80, 600), np.zeros(600)))
+    return OrbitEnvironment(elevation)
+
+
+@pytest.fixture
+def heat_generation():
+    """The board switching between two power levels every minute, for twenty minutes."""
+    power = np.where(np.arange(1200) // 60 % 2 == 0, 0.5, 3.0)
+    return TimeSeries(power[:, np.newaxis], ['Board'])
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+
+import pandas as pd
+
+from thermalmodel.benchmark import compare, loadResults, run, saveResults
+
+
+def test_benchmark_runs_the_given_steps():
+    results = run([3, 6], steps=40, repeat=1)
+    assert results['steps'].tolist() == [40, 40]
+    assert results['HSN'].tolist() == [3, 6]
+
+
+def test_compare_only_matches_the_same_configuration(tmp_path):
+    euler = run([3], steps=20, repeat=1)
+    implicit = run([3], steps=20, repeat=1, integrator='backward-euler')
+    filename = str(tmp_path / 'results.json')
+    saveResults(filename, pd.concat([euler, implicit], ignore_index=True))
+    baseline = loadResults(filename)
+    assert len(compare(baseline, euler)) == 1
+    assert len(compare(baseline, run([3], steps=20, repeat=1, linksPerIfn=1))) == 0
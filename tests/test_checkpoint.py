@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+import copy
+import os
+import numpy as np
+import pytest
+
+from thermalmodel.checkpoint import appendReadings, loadCheckpoint, readingsFilename
+from thermalmodel.recording import RecordEveryNth, RecordingPolicy, RecordOnChange, RecordWindowStatistics
+from thermalmodel.stopping import Predicate
+from thermalmodel.thermalmodel import ThermalModel
+
+POLICIES = [
+    lambda: RecordingPolicy(),
+    lambda: RecordEveryNth(7),
+    lambda: RecordWindowStatistics(10),
+    lambda: RecordOnChange(0.05),
+]
+POLICY_NAMES = ['every-step', 'every-nth', 'window-statistics', 'on-change']
+
+
+def interruptedRun(model_description, environment, checkpoint, policy, filename=None, **options):
+    # the first run gets killed after 250 s, the checkpoint being from 200 s
+    killed = ThermalModel(400, 1, copy.deepcopy(model_description), environment=environment, **options)
+    killed.simulate(filename, recording=policy(), checkpoint=checkpoint, checkpointEvery=50,
+                    stop=[Predicate(lambda time, temperature: time >= 250)])
+    resumed = ThermalModel(400, 1, copy.deepcopy(model_description), environment=environment, **options)
+    resumed.simulate(filename, recording=policy(), checkpoint=checkpoint, resume=True)
+    return resumed
+
+
+@pytest.mark.parametrize('integrator', ['euler', 'backward-euler', 'crank-nicolson'])
+@pytest.mark.parametrize('policy', POLICIES, ids=POLICY_NAMES)
+def test_resume_equals_uninterrupted_run(model_description, environment, tmp_path, integrator, policy):
+    reference = ThermalModel(400, 1, copy.deepcopy(model_description), environment=environment, integrator=integrator)
+    reference.simulate(recording=policy())
+    resumed = interruptedRun(model_description, environment, str(tmp_path / 'checkpoint.npz'), policy, integrator=integrator)
+    np.testing.assert_array_equal(resumed.temperatureReadings.to_numpy(), reference.temperatureReadings.to_numpy())
+
+
+def test_adaptive_resume_agrees_within_tolerance(model_description, environment, tmp_path):
+    reference = ThermalModel(400, 1, copy.deepcopy(model_description), environment=environment, integrator='adaptive')
+    reference.simulate()
+    resumed = interruptedRun(model_description, environment, str(tmp_path / 'checkpoint.npz'), POLICIES[0], integrator='adaptive')
+    np.testing.assert_allclose(resumed.temperatureReadings.to_numpy(), reference.temperatureReadings.to_numpy(), atol=1e-3)
+
+
+def test_resume_streamed_file(model_description, environment, tmp_path):
+    reference = tmp_path / 'reference.csv'
+    ThermalModel(400, 1, copy.deepcopy(model_description), environment=environment).simulate(str(reference), flushEvery=64)
+    streamed = tmp_path / 'streamed.csv'
+    interruptedRun(model_description, environment, str(tmp_path / 'checkpoint.npz'), POLICIES[0], str(streamed))
+    assert streamed.read_text() == reference.read_text()
+
+
+def test_checkpoint_holds_plain_arrays(model_description, environment, tmp_path):
+    checkpoint = str(tmp_path / 'checkpoint.npz')
+    model = ThermalModel(100, 1, model_description, environment=environment, integrator='backward-euler')
+    model.simulate(recording=RecordWindowStatistics(30), checkpoint=checkpoint, checkpointEvery=50)
+    state = loadCheckpoint(checkpoint)
+    assert all(array.dtype != object for array in state.values())
+    assert { 'recording/count', 'recording/sum', 'integrator/factorTemperature' } <= set(state)
+
+
+def test_checkpoints_append_the_readings(model_description, tmp_path, monkeypatch):
+    checkpoint = str(tmp_path / 'checkpoint.npz')
+    written = []
+    monkeypatch.setattr('thermalmodel.recording.appendReadings',
+                        lambda filename, start, times, values: written.append(times.shape[0] - start) or appendReadings(filename, start, times, values))
+    model = ThermalModel(200, 1, model_description)
+    model.simulate(checkpoint=checkpoint, checkpointEvery=50)
+    # every checkpoint only writes the readings since the previous one
+    assert written == [50, 50, 50, 50]
+    state = loadCheckpoint(checkpoint)
+    assert 'times' not in state and int(state['readings']) == 200
+    assert os.path.getsize(readingsFilename(checkpoint)) == 200 * (8 + 8 * 3)
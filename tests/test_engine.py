@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import copy
+import numpy as np
+import pytest
+
+import thermalmodel.links as links
+from thermalmodel.engine import BACKENDS
+from thermalmodel.thermalmodel import ThermalModel
+
+
+def objectGraphStep(model: ThermalModel):
+    # forward Euler on the node objects, every HSN starting from the same temperatures
+    nodes = list(model.heatStorageNodes.values())
+    deltas = [ hsn._computeTemperatureDifference() for hsn in nodes ]
+    for hsn, delta in zip(nodes, deltas):
+        hsn._temperature += delta
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_backend_matches_object_graph(model_description, backend):
+    reference = ThermalModel(200, 1, copy.deepcopy(model_description))
+    model = ThermalModel(200, 1, model_description, backend=backend)
+    for _ in range(200):
+        objectGraphStep(reference)
+        model.engine.step()
+    expected = [ hsn.getTemperature() for hsn in reference.heatStorageNodes.values() ]
+    np.testing.assert_allclose(model.engine.temperature, expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_jacobian_matches_finite_differences(model_description, environment, backend):
+    engine = ThermalModel(100, 1, model_description, backend=backend, environment=environment).engine
+    temperature = engine.temperature.copy()
+    jacobian = engine.jacobian(temperature).toarray()
+    step = 1e-3
+    for i in range(engine.countHSN):
+        delta = np.zeros_like(temperature)
+        delta[i] = step
+        column = (engine.heatExchange(temperature + delta) - engine.heatExchange(temperature - delta)) / (2 * step)
+        np.testing.assert_allclose(jacobian[:, i], column, rtol=1e-6, atol=1e-9)
+
+
+def test_backends_agree_with_environment(model_description, environment):
+    readings = []
+    for backend in BACKENDS:
+        model = ThermalModel(600, 1, copy.deepcopy(model_description), backend=backend, environment=environment)
+        model.simulate()
+        readings.append(model.temperatureReadings.to_numpy())
+    np.testing.assert_allclose(readings[0], readings[1], rtol=1e-12)
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_manual_links_see_the_current_temperatures(model_description, environment, backend):
+    reference = ThermalModel(600, 1, copy.deepcopy(model_description), backend=backend, environment=environment)
+    # the contact and conduction of BC-BAT, as computed by a ManualLink
+    interfaces = {}
+    conductance = 1e-3 / 0.05 + 1e-4 * 237 / 0.05
+
+    def contact():
+        return -conductance * (interfaces['BC-bottom'].getTemperature() - interfaces['BAT-top'].getTemperature())
+
+    _, _, bottomLinks = model_description[1][2][0]
+    bottomLinks[0] = ('BC-BAT', ('Battery', 'BAT-top'), [ links.ManualLink ], { 'func': contact })
+    model = ThermalModel(600, 1, model_description, backend=backend, environment=environment)
+    interfaces['BC-bottom'] = model.heatStorageNodes['Board'].interfaces['BC-bottom']
+    interfaces['BAT-top'] = model.heatStorageNodes['Battery'].interfaces['BAT-top']
+
+    reference.simulate()
+    model.simulate()
+    np.testing.assert_allclose(model.temperatureReadings.to_numpy(), reference.temperatureReadings.to_numpy(), rtol=1e-12)
+
+
+class FixedConductance(links.LinkType):
+    """Contact and conduction of BC-BAT, as a user-defined link type the compiler does not know."""
+
+    def computeHeatExchange(self) -> float:
+        conductance = 1e-3 / 0.05 + 1e-4 * 237 / 0.05
+        return -conductance * (self.node1.getTemperature() - self.node2.getTemperature())
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_custom_link_types_are_evaluated_through_their_objects(model_description, environment, backend):
+    reference = ThermalModel(600, 1, copy.deepcopy(model_description), backend=backend, environment=environment)
+    _, _, bottomLinks = model_description[1][2][0]
+    bottomLinks[0] = ('BC-BAT', ('Battery', 'BAT-top'), [ FixedConductance ], {})
+    model = ThermalModel(600, 1, model_description, backend=backend, environment=environment)
+    assert model.engine.linkTypeCounts['FixedConductance'] == 1
+    reference.simulate()
+    model.simulate()
+    np.testing.assert_allclose(model.temperatureReadings.to_numpy(), reference.temperatureReadings.to_numpy(), rtol=1e-12)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+import copy
+import numpy as np
+import pytest
+
+import thermalmodel.links as links
+from thermalmodel.schedules import DutyCycle
+from thermalmodel.thermalmodel import ThermalModel
+
+# a 1 g node tightly coupled to a heated 1 kg node
+CAPACITIES = np.array([0.9, 900.0])
+CONDUCTANCE = 2.0
+POWER = 9.0
+INITIAL = np.array([330.0, 290.0])
+
+
+def stiffDescription():
+    return [
+        ('Sensor', { 'mass': 0.001, 'heatCapacity': 900, 'temperature': INITIAL[0] }, [
+            ('S-base', {}, [
+                ('S-H', ('Housing', 'H-top'), [ links.ContactLink ], { 'contactArea': 1, 'resistance': 1 / CONDUCTANCE }),
+            ]),
+        ]),
+        ('Housing', { 'mass': 1, 'heatCapacity': 900, 'heatGeneration': POWER, 'temperature': INITIAL[1] }, [
+            ('H-top', {}, []),
+        ]),
+    ]
+
+
+def analytic(times: np.ndarray) -> np.ndarray:
+    # the mean rises linearly, the difference relaxes towards the one driven by the heating
+    c1, c2 = CAPACITIES
+    rate = CONDUCTANCE * (1 / c1 + 1 / c2)
+    mean = (c1 * INITIAL[0] + c2 * INITIAL[1]) / (c1 + c2) + POWER * times / (c1 + c2)
+    final = -POWER / (c2 * rate)
+    difference = final + (INITIAL[0] - INITIAL[1] - final) * np.exp(-rate * times)
+    return np.stack((mean + c2 / (c1 + c2) * difference, mean - c1 / (c1 + c2) * difference), axis=-1)
+
+
+def simulate(timestep: float, integrator: str, duration: float = 600, description: list = None, **options) -> np.ndarray:
+    description = stiffDescription() if description is None else description
+    model = ThermalModel(duration, timestep, description, integrator=integrator, integrator_options=options)
+    model.simulate()
+    readings = model.temperatureReadings
+    return readings['time'].to_numpy(), readings[['Sensor', 'Housing']].to_numpy()
+
+
+def test_explicit_euler_is_unstable_beyond_its_limit():
+    # the timestep is 5.5 times the limit 2 / rate of forward Euler
+    _, temperatures = simulate(10, 'euler', duration=200)
+    assert np.abs(temperatures[-1, 0] - temperatures[-1, 1]) > 1e3
+
+
+# Crank-Nicolson is not L-stable: the fast mode flips sign every step and decays only slowly
+@pytest.mark.parametrize('integrator, tolerance', [('backward-euler', 1e-6), ('crank-nicolson', 1e-2)])
+def test_implicit_methods_stay_accurate_on_stiff_models(integrator, tolerance):
+    times, temperatures = simulate(10, integrator)
+    settled = times >= 550
+    np.testing.assert_allclose(temperatures[settled], analytic(times[settled]), atol=tolerance)
+    # energy is conserved by every step, whatever the fast mode does
+    energy = temperatures @ CAPACITIES
+    np.testing.assert_allclose(energy, analytic(times) @ CAPACITIES, rtol=1e-12)
+
+
+@pytest.mark.parametrize('integrator, order', [('euler', 1), ('backward-euler', 1), ('crank-nicolson', 2)])
+def test_order_of_convergence(integrator, order):
+    errors = []
+    for timestep in (0.1, 0.05):
+        times, temperatures = simulate(timestep, integrator, duration=2)
+        errors.append(np.max(np.abs(temperatures - analytic(times))))
+    assert np.log2(errors[0] / errors[1]) == pytest.approx(order, abs=0.1)
+
+
+@pytest.mark.parametrize('method', ['LSODA', 'Radau', 'BDF'])
+def test_adaptive_meets_its_tolerance_on_stiff_models(method):
+    times, temperatures = simulate(10, 'adaptive', method=method, rtol=1e-8, atol=1e-6)
+    np.testing.assert_allclose(temperatures, analytic(times), atol=1e-4)
+
+
+@pytest.mark.parametrize('method', ['LSODA', 'RK45', 'BDF'])
+def test_adaptive_does_not_step_over_short_pulses(method):
+    # 200 W during 10 s in the middle of an otherwise quiet phase
+    description = stiffDescription()
+    description[1][1]['heatGeneration'] = DutyCycle(600, 10, 200, phase=300)
+    times, temperatures = simulate(10, 'adaptive', description=description, method=method)
+    energy = temperatures[-1] @ CAPACITIES - INITIAL @ CAPACITIES
+    assert energy == pytest.approx(2000, rel=1e-6)
+    referenceTimes, reference = simulate(1, 'crank-nicolson', description=description)
+    np.testing.assert_allclose(temperatures, reference[np.isin(referenceTimes, times)], atol=1e-3)
+
+
+def test_adaptive_steps_over_smooth_orbit_loads(model_description, environment):
+    model = ThermalModel(1200, 1, copy.deepcopy(model_description), environment=environment, integrator='adaptive')
+    # the solver only restarts when the orbit enters the eclipse
+    np.testing.assert_array_equal(model.engine.loadChanges(), [600])
+    evaluations = []
+    rate = model.integrator._temperatureRate
+    model.integrator._temperatureRate = lambda time, temperature: evaluations.append(time) or rate(time, temperature)
+    model.simulate()
+    assert len(evaluations) < 300
+    reference = ThermalModel(1200, 1, model_description, environment=environment, integrator='crank-nicolson')
+    reference.simulate()
+    # the fixed-step integrators hold the loads of every step instead of interpolating them
+    np.testing.assert_allclose(model.temperatureReadings.to_numpy(), reference.temperatureReadings.to_numpy(), atol=0.05)
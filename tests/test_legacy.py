@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+
+import os
+import numpy as np
+import pandas as pd
+
+from thermalmodel.legacy import legacyInterfaceHeat, loadLegacyModel
+
+LEGACY_INPUT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'old-script', 'input')
+
+
+def test_first_step_matches_legacy_results(tmp_path):
+    model = loadLegacyModel(LEGACY_INPUT, 5, cacheDirectory=str(tmp_path))
+    model.simulate()
+    temperatures = model.temperatureReadings.drop(columns='time').to_numpy()
+    heat = legacyInterfaceHeat(model).to_numpy()
+    expectedTemperatures = pd.read_csv(os.path.join(LEGACY_INPUT, 'T_store.csv'), index_col=0).to_numpy()
+    expectedHeat = pd.read_csv(os.path.join(LEGACY_INPUT, 'Q_net.csv'), index_col=0).to_numpy()
+    # the script uses a rounded Stefan-Boltzmann constant, and diverges after three steps
+    np.testing.assert_allclose(temperatures[0], expectedTemperatures[0], atol=1e-5)
+    np.testing.assert_allclose(heat[0], expectedHeat[0], atol=1e-4)
+    # the tracked input directory is left untouched
+    assert sorted(os.listdir(tmp_path)) == ['ele.csv.npy', 'heat_generated.csv.npy']
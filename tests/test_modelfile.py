@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+import copy
+import numpy as np
+import pytest
+
+from thermalmodel.engine import BACKENDS
+from thermalmodel.schedules import DutyCycle
+from thermalmodel.thermalmodel import ThermalModel, setDescriptionParameter
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_exported_model_simulates_like_the_original(model_description, environment, heat_generation, backend, tmp_path):
+    setDescriptionParameter(model_description, 'Panel/heatGeneration', DutyCycle(300, 30, 5))
+    original = ThermalModel(600, 1, copy.deepcopy(model_description), backend=backend,
+                            environment=environment, heat_generation=heat_generation)
+    filename = str(tmp_path / 'model.npz')
+    original.export(filename)
+    loaded = ThermalModel.fromFile(filename, backend=backend)
+
+    expected = original.engine.arrays()
+    arrays = loaded.engine.arrays()
+    assert arrays.keys() == expected.keys()
+    for name, values in expected.items():
+        np.testing.assert_array_equal(arrays[name], values, err_msg=name)
+    for kind in ('HSN', 'IFN', 'links'):
+        assert loaded.index[kind].names == original.index[kind].names
+
+    original.simulate()
+    loaded.simulate()
+    np.testing.assert_array_equal(loaded.temperatureReadings.to_numpy(), original.temperatureReadings.to_numpy())
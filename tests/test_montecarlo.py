@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from thermalmodel.montecarlo import MonteCarlo
+from thermalmodel.sweep import ParametricSweep
+
+from conftest import HSN_NAMES
+
+DISTRIBUTIONS = {
+    'Battery/mass': ('normal', 0.3, 0.03),
+    'Board/BC-bottom/BC-BAT/resistance': ('uniform', 0.02, 0.08),
+    'Panel/P-outer/absorptivity': ('uniform', 0.2, 0.9),
+}
+
+
+def monteCarlo(model_description, environment, workers, chunksize, heat_generation=None):
+    runner = MonteCarlo(300, 1, model_description, DISTRIBUTIONS, runs=7, seed=42,
+                        workers=workers, chunksize=chunksize, environment=environment, heat_generation=heat_generation)
+    runner.simulate()
+    return runner
+
+
+def test_results_do_not_depend_on_workers_and_chunks(model_description, environment):
+    single = monteCarlo(model_description, environment, 1, 7)
+    pooled = monteCarlo(model_description, environment, 2, 3)
+    pd.testing.assert_frame_equal(pooled.samples, single.samples)
+    pd.testing.assert_frame_equal(pooled.summary, single.summary)
+
+
+@pytest.mark.parametrize('withHeatGeneration', [False, True])
+def test_summary_matches_sweep_of_the_samples(model_description, environment, heat_generation, withHeatGeneration):
+    series = heat_generation if withHeatGeneration else None
+    runner = monteCarlo(model_description, environment, 2, 3, heat_generation=series)
+    sweep = ParametricSweep(300, 1, model_description, runner.samples, environment=environment, heat_generation=series)
+    readings = sweep.simulate()
+    for run, summary in runner.summary.groupby('run'):
+        temperatures = readings[readings['variant'] == run]['temperature'].to_numpy().reshape(-1, len(HSN_NAMES))
+        assert summary['HSN'].tolist() == HSN_NAMES
+        np.testing.assert_array_equal(summary['min'], temperatures.min(axis=0))
+        np.testing.assert_array_equal(summary['max'], temperatures.max(axis=0))
+        for percentile in (5, 50, 95):
+            np.testing.assert_allclose(summary[f'p{percentile}'], np.percentile(temperatures, percentile, axis=0), rtol=1e-12)
+
+
+
+def test_heat_generation_reaches_the_workers(model_description, environment, heat_generation):
+    constant = monteCarlo(model_description, environment, 2, 3)
+    switching = monteCarlo(model_description, environment, 2, 3, heat_generation=heat_generation)
+    pd.testing.assert_frame_equal(switching.samples, constant.samples)
+    board = lambda runner: runner.summary[runner.summary['HSN'] == 'Board']
+    # the board cools down from its initial temperature, the extra power slows that down
+    assert (board(switching)['min'].to_numpy() > board(constant)['min'].to_numpy() + 1).all()
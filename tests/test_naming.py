@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import re
+import numpy as np
+import pytest
+
+from thermalmodel.naming import NameIndex
+from thermalmodel.thermalmodel import ThermalModel
+
+from conftest import HSN_NAMES
+
+IFN_NAMES = [
+    'Battery/BAT-top', 'Battery/BAT-bottom',
+    'Board/BC-bottom', 'Board/BC-side',
+    'Panel/P-inner', 'Panel/P-outer',
+]
+# only the links given in the model description, not their generated inverses
+LINK_NAMES = ['Board/BC-bottom/BC-BAT', 'Panel/P-inner/P-BC', 'Panel/P-inner/P-BAT']
+
+
+def test_names_and_IDs_round_trip():
+    index = NameIndex(['a', 'b'])
+    obj = object()
+    assert index.add('c', obj) == 2
+    assert len(index) == 3 and 'b' in index and 'd' not in index
+    for ID, name in enumerate(['a', 'b', 'c']):
+        assert index.ID(name) == ID
+        assert index.name(ID) == name
+    np.testing.assert_array_equal(index.IDs(['c', 'a']), [2, 0])
+    assert index.IDs(['c', 'a']).dtype == np.intp
+    assert index.objectID(obj) == 2
+
+
+def test_unknown_names_are_rejected():
+    index = NameIndex(['a'])
+    with pytest.raises(KeyError, match="Unknown name 'b'"):
+        index.ID('b')
+    with pytest.raises(KeyError, match="Unknown name 'b'"):
+        index.IDs(['a', 'b'])
+    with pytest.raises(KeyError, match="Name 'a' is already taken"):
+        index.add('a')
+
+
+@pytest.mark.parametrize('kind, names', [
+    ('HSN', HSN_NAMES),
+    ('IFN', IFN_NAMES),
+    ('links', LINK_NAMES),
+])
+def test_model_labels_and_IDs_round_trip(model_description, kind, names):
+    model = ThermalModel(10, 1, model_description)
+    assert model.index[kind].names == names
+    for ID, name in enumerate(names):
+        assert model.label2ID(kind, name) == ID
+        assert model.ID2label(kind, ID) == name
+
+
+def test_model_rejects_unknown_labels(model_description):
+    model = ThermalModel(10, 1, model_description)
+    with pytest.raises(KeyError, match="Unknown name 'Panel/P-side'"):
+        model.label2ID('IFN', 'Panel/P-side')
+    # IFN are named by their path
+    with pytest.raises(KeyError, match="Unknown name 'P-inner'"):
+        model.label2ID('IFN', 'P-inner')
+    with pytest.raises(IndexError):
+        model.ID2label('HSN', len(HSN_NAMES))
+
+
+def test_display_outlines_the_model(model_description, capsys):
+    model = ThermalModel(10, 1, model_description)
+    model.display()
+    # object addresses change between runs
+    lines = [ re.sub(r' <[^>]* at 0x[0-9a-f]+>', '', line) for line in capsys.readouterr().out.splitlines() ]
+    outline = [ line for line in lines if line.lstrip().startswith('- ') ]
+    assert outline == [
+        '- Battery',
+        '    - BAT-top',
+        '        - BC-BAT-inversed',
+        '    - BAT-bottom',
+        '        - P-BAT-inversed',
+        '- Board',
+        '    - BC-bottom',
+        '        - BC-BAT',
+        '    - BC-side',
+        '        - P-BC-inversed',
+        '- Panel',
+        '    - P-inner',
+        '        - P-BC',
+        '        - P-BAT',
+        '    - P-outer',
+    ]
+    battery = lines.index('- Battery')
+    assert lines[battery + 1:battery + 5] == [
+        '  mass: 0.3',
+        '  heatCapacity: 900',
+        '  heatGeneration: 1.5',
+        '  temperature: 293.15',
+    ]
+    # links name the IFN they connect
+    link = lines.index('        - BC-BAT')
+    assert '          node1: BC-bottom' in lines[link:]
+    assert '          node2: BAT-top' in lines[link:]
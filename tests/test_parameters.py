@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import copy
+import numpy as np
+import pytest
+
+from thermalmodel.engine import BACKENDS
+from thermalmodel.schedules import DutyCycle
+from thermalmodel.thermalmodel import ThermalModel, setDescriptionParameter
+
+PARAMETERS = [
+    ('Battery/mass', 0.45),
+    ('Board/heatCapacity', 500),
+    ('Panel/heatGeneration', 2.0),
+    ('Panel/heatGeneration', DutyCycle(120, 20, 4)),
+    ('Board/BC-side/emissivity', 0.3),
+    ('Panel/P-outer/sunAccess', 0.5),
+    ('Board/BC-bottom/BC-BAT/resistance', 0.01),
+    ('Panel/P-inner/P-BAT/viewingFactor', 0.8),
+]
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+@pytest.mark.parametrize('path, value', PARAMETERS)
+def test_set_parameter_equals_rebuild(model_description, environment, backend, path, value):
+    rebuiltDescription = copy.deepcopy(model_description)
+    setDescriptionParameter(rebuiltDescription, path, value)
+    rebuilt = ThermalModel(300, 1, rebuiltDescription, backend=backend, environment=environment)
+    model = ThermalModel(300, 1, model_description, backend=backend, environment=environment)
+    model.setParameter(path, value)
+
+    for name, array in rebuilt.engine.arrays().items():
+        np.testing.assert_allclose(getattr(model.engine, name), array, rtol=1e-14, err_msg=name)
+    model.simulate()
+    rebuilt.simulate()
+    np.testing.assert_allclose(model.temperatureReadings.to_numpy(), rebuilt.temperatureReadings.to_numpy(), rtol=1e-12)
+
+
+@pytest.mark.parametrize('parameter', ['mass', 'heatCapacity'])
+def test_set_parameter_of_scheduled_node(model_description, parameter):
+    setDescriptionParameter(model_description, 'Panel/heatGeneration', DutyCycle(120, 20, 4))
+    rebuiltDescription = copy.deepcopy(model_description)
+    setDescriptionParameter(rebuiltDescription, f'Panel/{parameter}', 0.5)
+    model = ThermalModel(300, 1, model_description)
+    model.setParameter(f'Panel/{parameter}', 0.5)
+    rebuilt = ThermalModel(300, 1, rebuiltDescription)
+    np.testing.assert_array_equal(model.engine.capacity, rebuilt.engine.capacity)
+    np.testing.assert_array_equal(model.engine.heatGeneration, rebuilt.engine.heatGeneration)
+    np.testing.assert_array_equal(model.engine.scheduledHeatGeneration, rebuilt.engine.scheduledHeatGeneration)
+
+
+@pytest.mark.parametrize('path, message', [
+    ('Board/BC-bottom/BC-BAT/resistence', "Unknown parameter 'resistence'"),
+    ('Board/BC-bottom/BC-BAT/viewingFactor', "Unknown parameter 'viewingFactor'"),
+    ('Battery/BAT-top/BC-BAT-inversed/resistance', 'mirrors another link'),
+])
+def test_set_parameter_rejects_invalid_link_parameters(model_description, path, message):
+    model = ThermalModel(300, 1, model_description)
+    conductance = model.engine.linearConductance.copy()
+    with pytest.raises(KeyError, match=message):
+        model.setParameter(path, 0.01)
+    np.testing.assert_array_equal(model.engine.linearConductance, conductance)
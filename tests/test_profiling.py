@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import pytest
+
+from thermalmodel.profiling import LINK_STAGES, Profiler
+from thermalmodel.stopping import Predicate
+from thermalmodel.thermalmodel import ThermalModel
+
+STAGES = [ stage for stage, _ in LINK_STAGES.values() ] + ['jacobian', 'HSN update', 'recording', 'other']
+PATCHED = [ *LINK_STAGES, 'jacobian' ]
+
+
+def assertDetached(model: ThermalModel):
+    for name in PATCHED:
+        assert name not in vars(model.engine)
+    assert 'step' not in vars(model.integrator)
+
+
+@pytest.mark.parametrize('integrator', ['euler', 'backward-euler'])
+def test_summary_covers_every_stage(model_description, environment, integrator):
+    profiler = Profiler()
+    model = ThermalModel(100, 1, model_description, environment=environment, integrator=integrator)
+    model.simulate(profiler=profiler)
+    summary = profiler.summary()
+    assert summary.index.tolist() == STAGES
+    assert summary.loc['HSN update', 'calls'] == summary.loc['recording', 'calls'] == summary.loc['other', 'calls'] == 100
+    assert summary.loc['linear links', 'calls'] >= 100 and summary.loc['manual links', 'calls'] >= 100
+    assert (summary.loc['jacobian', 'calls'] > 0) == (integrator == 'backward-euler')
+    assert summary['share (%)'].sum() == pytest.approx(100)
+    assert summary['total (s)'].sum() == pytest.approx(sum(profiler.stepTimes))
+    assert profiler.linkTypes().loc['ContactLink', 'instances'] == 1
+    assert profiler.linkTypes().loc['RadiationLink', 'instances'] == 2
+
+
+def test_methods_are_restored_after_detach(model_description):
+    model = ThermalModel(20, 1, model_description)
+    engineStep = model.integrator.step
+    profiler = Profiler()
+    profiler.attach(model, lambda time, temperature: None)
+    for name in PATCHED:
+        assert name in vars(model.engine)
+    profiler.detach()
+    assertDetached(model)
+    assert model.integrator.step == engineStep
+
+    # simulations ending with an error detach as well
+    def fail(time, temperature):
+        raise RuntimeError('stop')
+    with pytest.raises(RuntimeError):
+        model.simulate(profiler=Profiler(), stop=[Predicate(fail)])
+    assertDetached(model)
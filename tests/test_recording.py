@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+import copy
+import numpy as np
+import pytest
+
+from thermalmodel.recording import RecordEveryNth, RecordOnChange, RecordWindowStatistics
+from thermalmodel.stopping import Predicate
+from thermalmodel.thermalmodel import ThermalModel
+
+from conftest import HSN_NAMES
+
+
+@pytest.fixture
+def fullResolution(model_description, environment):
+    """Times and HSN temperatures of every step of a 300 s simulation."""
+    model = ThermalModel(300, 1, copy.deepcopy(model_description), environment=environment)
+    model.simulate()
+    readings = model.temperatureReadings
+    return readings['time'].to_numpy(), readings[HSN_NAMES].to_numpy()
+
+
+def simulateWith(model_description, environment, recording):
+    model = ThermalModel(300, 1, model_description, environment=environment)
+    model.simulate(recording=recording)
+    return model.temperatureReadings
+
+
+@pytest.mark.parametrize('n', [1, 7, 300])
+def test_every_nth_records_every_nth_step(model_description, environment, fullResolution, n):
+    times, temperatures = fullResolution
+    readings = simulateWith(model_description, environment, RecordEveryNth(n))
+    # the n-th, 2n-th, ... step, i.e. indices n-1, 2n-1, ...
+    steps = np.arange(n - 1, len(times), n)
+    np.testing.assert_array_equal(readings['time'], times[steps])
+    np.testing.assert_array_equal(readings[HSN_NAMES].to_numpy(), temperatures[steps])
+
+
+@pytest.mark.parametrize('window', [10, 7])
+def test_window_statistics_summarize_every_window(model_description, environment, fullResolution, window):
+    times, temperatures = fullResolution
+    readings = simulateWith(model_description, environment, RecordWindowStatistics(window))
+    assert list(readings.columns) == ['time', *(f'{name} {statistic}' for name in HSN_NAMES for statistic in ('min', 'max', 'mean'))]
+    # a window of 7 leaves a last window of 300 % 7 = 6 steps, recorded at the end of the simulation
+    starts = np.arange(0, len(times), window)
+    assert len(readings) == len(starts)
+    for row, start in enumerate(starts):
+        steps = slice(start, start + window)
+        assert readings['time'].iloc[row] == times[steps][-1]
+        for i, name in enumerate(HSN_NAMES):
+            np.testing.assert_array_equal(readings[f'{name} min'].iloc[row], temperatures[steps, i].min())
+            np.testing.assert_array_equal(readings[f'{name} max'].iloc[row], temperatures[steps, i].max())
+            np.testing.assert_allclose(readings[f'{name} mean'].iloc[row], temperatures[steps, i].mean(), rtol=1e-12)
+
+
+@pytest.mark.parametrize('threshold', [0.1, 0.5])
+def test_on_change_records_steps_beyond_the_threshold(model_description, environment, fullResolution, threshold):
+    times, temperatures = fullResolution
+    readings = simulateWith(model_description, environment, RecordOnChange(threshold))
+    recordedTimes = readings['time'].to_numpy()
+    recorded = readings[HSN_NAMES].to_numpy()
+
+    # the first step, then every step moving any HSN by more than the threshold from the last recorded one
+    expected = [0]
+    for step in range(1, len(times)):
+        if np.max(np.abs(temperatures[step] - temperatures[expected[-1]])) > threshold:
+            expected.append(step)
+    assert 1 < len(expected) < len(times) - 1
+    # the last step did not change enough, it was pending and recorded once the simulation reached its duration
+    assert expected[-1] != len(times) - 1
+    expected.append(len(times) - 1)
+
+    np.testing.assert_array_equal(recordedTimes, times[expected])
+    np.testing.assert_array_equal(recorded, temperatures[expected])
+    assert np.all(np.max(np.abs(np.diff(recorded[:-1], axis=0)), axis=1) > threshold)
+    assert np.max(np.abs(recorded[-1] - recorded[-2])) <= threshold
+
+
+def test_on_change_keeps_the_pending_step_of_a_stopped_simulation(model_description, environment):
+    model = ThermalModel(300, 1, model_description, environment=environment)
+    recording = RecordOnChange(1000)
+    # nothing changes by 1000 K, only the first step is recorded
+    model.simulate(recording=recording, stop=[Predicate(lambda time, temperature: time >= 100)])
+    np.testing.assert_array_equal(model.temperatureReadings['time'], [1])
+    model.simulate(recording=recording)
+    np.testing.assert_array_equal(model.temperatureReadings['time'], [1, 300])
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import pytest
+
+from thermalmodel.schedules import DutyCycle, Periodic, PiecewiseConstant, Tabulated
+from thermalmodel.thermalmodel import ThermalModel, setDescriptionParameter
+
+
+def test_piecewise_constant_switches_at_its_breakpoints():
+    schedule = PiecewiseConstant([10, 20, 30], [1, 2, 3])
+    times = np.array([10, 19.999, 20, 29.999, 30, 1e6])
+    np.testing.assert_array_equal(schedule.values(times), [1, 1, 2, 2, 3, 3])
+
+
+def test_piecewise_constant_holds_its_first_value_before_the_first_breakpoint():
+    schedule = PiecewiseConstant([10, 20], [1, 2])
+    np.testing.assert_array_equal(schedule.values(np.array([-5, 0, 9.999])), [1, 1, 1])
+
+
+@pytest.mark.parametrize('breakpoints, values, message', [
+    ([0, 10], [1, 2, 3], 'one value per breakpoint'),
+    ([10, 0], [1, 2], 'sorted'),
+])
+def test_piecewise_constant_rejects_invalid_breakpoints(breakpoints, values, message):
+    with pytest.raises(ValueError, match=message):
+        PiecewiseConstant(breakpoints, values)
+
+
+def test_tabulated_interpolates_between_its_points():
+    schedule = Tabulated([0, 10, 30], [0, 5, 1])
+    times = np.array([0, 2.5, 10, 20, 25, 30])
+    np.testing.assert_allclose(schedule.values(times), [0, 1.25, 5, 3, 2, 1], rtol=1e-12)
+
+
+def test_tabulated_holds_its_end_values_outside_the_table():
+    schedule = Tabulated([10, 20], [4, 6])
+    np.testing.assert_array_equal(schedule.values(np.array([-1, 0, 9.999, 20.001, 1e6])), [4, 4, 4, 6, 6])
+
+
+def test_periodic_wraps_around_at_its_period():
+    schedule = Periodic(Tabulated([0, 100], [0, 100]), 60)
+    times = np.array([0, 30, 59.5, 60, 90, 120, 179.5])
+    np.testing.assert_allclose(schedule.values(times), [0, 30, 59.5, 0, 30, 0, 59.5], rtol=1e-12)
+
+
+def test_periodic_shifts_by_its_phase():
+    schedule = Periodic(Tabulated([0, 100], [0, 100]), 60, phase=15)
+    # before the phase, the previous period is repeated
+    times = np.array([0, 14, 15, 74, 75])
+    np.testing.assert_allclose(schedule.values(times), [45, 59, 0, 59, 0], rtol=1e-12)
+
+
+def test_duty_cycle_switches_on_and_off():
+    schedule = DutyCycle(period=100, onDuration=20, power=4, standby=0.5)
+    times = np.array([0, 19.999, 20, 99.999, 100, 119.999, 120, 200])
+    np.testing.assert_array_equal(schedule.values(times), [4, 4, 0.5, 0.5, 4, 4, 0.5, 4])
+
+
+def test_duty_cycle_with_phase_starts_in_standby():
+    schedule = DutyCycle(period=100, onDuration=20, power=4, phase=50)
+    times = np.array([0, 49.999, 50, 69.999, 70, 150])
+    np.testing.assert_array_equal(schedule.values(times), [0, 0, 4, 4, 0, 4])
+
+
+def test_model_evaluates_schedules_at_the_start_of_every_step(model_description):
+    schedule = DutyCycle(period=60, onDuration=15, power=4)
+    setDescriptionParameter(model_description, 'Panel/heatGeneration', schedule)
+    model = ThermalModel(300, 1, model_description)
+    startTimes = np.arange(0, 300)
+    assert model.engine.scheduledHeatGeneration.shape == (300, 1)
+    np.testing.assert_array_equal(model.engine.scheduledHeatGeneration[:, 0], schedule.values(startTimes))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+import copy
+import numpy as np
+import pytest
+
+from thermalmodel.recording import RecordEveryNth, RecordOnChange, RecordWindowStatistics
+from thermalmodel.stopping import Predicate
+from thermalmodel.thermalmodel import ThermalModel
+
+
+@pytest.mark.parametrize('integrator', ['euler', 'backward-euler', 'adaptive'])
+def test_simulation_continues_after_a_stop(model_description, environment, integrator):
+    reference = ThermalModel(300, 1, copy.deepcopy(model_description), environment=environment, integrator=integrator)
+    reference.simulate()
+    model = ThermalModel(300, 1, model_description, environment=environment, integrator=integrator)
+    model.simulate(stop=[Predicate(lambda time, temperature: time >= 120)])
+    assert model.temperatureReadings['time'].iloc[-1] == 120
+    model.simulate()
+    np.testing.assert_array_equal(model.temperatureReadings['time'], reference.temperatureReadings['time'])
+    np.testing.assert_allclose(model.temperatureReadings.to_numpy(), reference.temperatureReadings.to_numpy(), rtol=1e-12)
+
+
+def test_simulation_continues_with_changed_parameters(model_description):
+    model = ThermalModel(300, 1, model_description)
+    model.simulate(stop=[Predicate(lambda time, temperature: time >= 100)])
+    model.setParameter('Battery/heatGeneration', 0)
+    model.simulate()
+    readings = model.temperatureReadings
+    assert readings['time'].is_unique and len(readings) == 300
+    battery = readings['Battery'].to_numpy()
+    # heated up until the heater was switched off
+    assert battery[99] > battery[0] and battery[-1] < battery[99]
+
+
+def test_simulation_ends_at_its_duration(model_description):
+    model = ThermalModel(10, 1, model_description)
+    model.simulate()
+    with pytest.raises(ValueError, match='already reached its duration'):
+        model.simulate()
+    model.compile()
+    model.simulate()
+    assert model.temperatureReadings['time'].tolist() == list(range(1, 11))
+
+
+def test_simulation_continues_streaming_to_its_file(model_description, tmp_path):
+    reference = tmp_path / 'reference.csv'
+    ThermalModel(100, 1, copy.deepcopy(model_description)).simulate(str(reference), flushEvery=16)
+    streamed = tmp_path / 'streamed.csv'
+    model = ThermalModel(100, 1, model_description)
+    model.simulate(str(streamed), flushEvery=16, stop=[Predicate(lambda time, temperature: time >= 40)])
+    with pytest.raises(ValueError, match='were not streamed to it'):
+        model.simulate(str(tmp_path / 'other.csv'))
+    model.simulate(str(streamed), flushEvery=16)
+    assert streamed.read_text() == reference.read_text()
+
+
+@pytest.mark.parametrize('policy', [
+    lambda: RecordEveryNth(7),
+    lambda: RecordWindowStatistics(10),
+    lambda: RecordOnChange(0.05),
+], ids=['every-nth', 'window-statistics', 'on-change'])
+@pytest.mark.parametrize('samePolicy', [True, False], ids=['same-policy', 'new-policy'])
+def test_continued_recording_equals_uninterrupted_run(model_description, environment, policy, samePolicy):
+    reference = ThermalModel(100, 1, copy.deepcopy(model_description), environment=environment)
+    reference.simulate(recording=policy())
+    model = ThermalModel(100, 1, model_description, environment=environment)
+    recording = policy()
+    model.simulate(recording=recording, stop=[Predicate(lambda time, temperature: time >= 45)])
+    model.simulate(recording=recording if samePolicy else policy())
+    np.testing.assert_array_equal(model.temperatureReadings.to_numpy(), reference.temperatureReadings.to_numpy())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import pytest
+
+import thermalmodel.links as links
+
+from thermalmodel.engine import BACKENDS
+from thermalmodel.environment import OrbitEnvironment
+from thermalmodel.thermalmodel import ThermalModel
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_steady_state_equals_long_run(model_description, backend):
+    # constant sun elevation, such that the loads do not change over time
+    environment = OrbitEnvironment(np.full(10, 45.0))
+    model = ThermalModel(40000, 20, model_description, backend=backend, integrator='backward-euler', environment=environment)
+    steadyState = model.solve_steady_state()
+    np.testing.assert_allclose(model.engine.heatExchange(steadyState.to_numpy()), 0, atol=1e-9)
+    model.simulate()
+    np.testing.assert_allclose(model.temperatureReadings.iloc[-1][steadyState.index], steadyState, atol=1e-6)
+
+
+def test_steady_state_requires_a_sink(model_description):
+    # without an environment the heat has nowhere to go
+    model = ThermalModel(10, 1, model_description)
+    with pytest.raises(RuntimeError, match='Singular Jacobian'):
+        model.solve_steady_state()
+
+
+def coupledDescription(linkTypes, parameters):
+    # a heated box radiating to space, and an unheated one attached only to it
+    return [
+        ('Box', { 'mass': 1, 'heatCapacity': 900, 'heatGeneration': 2.0, 'temperature': 290.0 }, [
+            ('B-outer', { 'emissivity': 0.8, 'absorptivity': 0.5, 'area': 0.01, 'spaceAccess': 1 }, []),
+            ('B-inner', {}, [
+                ('B-S', ('Sensor', 'S-base'), linkTypes, parameters),
+            ]),
+        ]),
+        ('Sensor', { 'mass': 0.1, 'heatCapacity': 900, 'heatGeneration': 0.5, 'temperature': 280.0 }, [
+            ('S-base', {}, []),
+        ]),
+    ]
+
+
+def manualDescription(func):
+    interfaces = {}
+    description = coupledDescription([ links.ManualLink ], { 'func': lambda: func(interfaces['B'].getTemperature(), interfaces['S'].getTemperature()) })
+    model = ThermalModel(10, 1, description, environment=OrbitEnvironment(np.zeros(10)))
+    interfaces['B'] = model.heatStorageNodes['Box'].interfaces['B-inner']
+    interfaces['S'] = model.heatStorageNodes['Sensor'].interfaces['S-base']
+    return model
+
+
+def test_steady_state_through_manual_links():
+    contact = ThermalModel(10, 1, coupledDescription([ links.ContactLink ], { 'contactArea': 1, 'resistance': 2 }),
+                           environment=OrbitEnvironment(np.zeros(10)))
+    manual = manualDescription(lambda box, sensor: -0.5 * (box - sensor))
+    expected = contact.solve_steady_state()
+    steadyState = manual.solve_steady_state()
+    np.testing.assert_allclose(steadyState, expected, rtol=1e-9)
+    np.testing.assert_allclose(manual.engine.heatExchange(steadyState.to_numpy()), 0, atol=1e-6)
+
+
+def test_steady_state_raises_when_the_line_search_fails():
+    # a weak contact always carrying at least 2 W from the warmer to the colder box: the
+    # residual heat of the sensor jumps from -1.5 W to 2.5 W as the temperatures cross
+    model = manualDescription(lambda box, sensor: -0.01 * (box - sensor) - 2.0 * np.sign(box - sensor))
+    with pytest.raises(RuntimeError, match='line search failed'):
+        model.solve_steady_state()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import copy
+import numpy as np
+
+import thermalmodel.links as links
+from thermalmodel.stopping import Converged, Predicate, TemperatureLimit
+from thermalmodel.thermalmodel import ThermalModel
+
+from conftest import HSN_NAMES
+
+
+def relaxingDescription():
+    # two unheated nodes settling at their common temperature
+    return [
+        ('Hot', { 'mass': 0.1, 'heatCapacity': 900, 'temperature': 320.0 }, [
+            ('H-base', {}, [
+                ('H-C', ('Cold', 'C-top'), [ links.ContactLink ], { 'contactArea': 1, 'resistance': 10 }),
+            ]),
+        ]),
+        ('Cold', { 'mass': 0.1, 'heatCapacity': 900, 'temperature': 280.0 }, [
+            ('C-top', {}, []),
+        ]),
+    ]
+
+
+def readings(model: ThermalModel) -> np.ndarray:
+    return model.temperatureReadings[[ name for name, _ in model.IDmap['HSN'] ]].to_numpy()
+
+
+def test_converged_stops_once_the_rate_is_below_tolerance():
+    reference = ThermalModel(2000, 1, relaxingDescription())
+    reference.simulate()
+    temperatures = np.vstack(([320.0, 280.0], readings(reference)))
+    # rate over every 10 steps, checked at the end of each
+    rates = np.max(np.abs(temperatures[10::10] - temperatures[:-10:10]), axis=1) / 10
+    expected = 10 * (np.flatnonzero(rates < 1e-3)[0] + 1)
+
+    condition = Converged(1e-3, every=10)
+    model = ThermalModel(2000, 1, relaxingDescription())
+    model.simulate(stop=[condition])
+    assert model.stoppedBy is condition
+    assert model.temperatureReadings['time'].iloc[-1] == expected
+    assert condition.message.startswith(f'Converged at t={expected}: temperatures change by at most')
+
+
+def test_temperature_limit_stops_at_the_first_violation(model_description, environment):
+    reference = ThermalModel(600, 1, copy.deepcopy(model_description), environment=environment)
+    reference.simulate()
+    battery = reference.temperatureReadings['Battery'].to_numpy()
+    upper = battery[0] + 0.5 * (battery.max() - battery[0])
+    expected = reference.temperatureReadings['time'].to_numpy()[np.flatnonzero(battery > upper)[0]]
+
+    condition = TemperatureLimit(upper=upper, nodes=['Battery'])
+    model = ThermalModel(600, 1, model_description, environment=environment)
+    model.simulate(stop=[condition])
+    assert model.stoppedBy is condition
+    assert model.temperatureReadings['time'].iloc[-1] == expected
+    assert condition.message == f"Temperature limits [-inf, {upper}] K violated at t={expected} by ['Battery']"
+
+
+def test_temperature_limit_watches_all_nodes_by_default(model_description):
+    condition = TemperatureLimit(lower=0, upper=290)
+    model = ThermalModel(10, 1, model_description)
+    model.simulate(stop=[condition])
+    # the Panel starts below, Battery and Board above
+    assert model.temperatureReadings['time'].tolist() == [1]
+    assert condition.message == f"Temperature limits [0, 290] K violated at t=1 by {HSN_NAMES[:2]}"
+
+
+def test_predicate_stops_when_it_returns_true(model_description):
+    seen = []
+
+    def reached(time, temperature):
+        seen.append(time)
+        return temperature[0] > 293.2
+
+    condition = Predicate(reached, 'Battery warmed up')
+    model = ThermalModel(600, 1, model_description)
+    model.simulate(stop=[condition])
+    stopped = model.temperatureReadings['time'].iloc[-1]
+    assert seen == list(range(1, stopped + 1))
+    assert model.temperatureReadings['Battery'].iloc[-1] > 293.2 >= model.temperatureReadings['Battery'].iloc[-2]
+    assert condition.message == f'Battery warmed up at t={stopped}'
+
+
+def test_stopped_by_is_reset_by_the_next_simulation(model_description):
+    condition = Predicate(lambda time, temperature: time >= 5)
+    model = ThermalModel(10, 1, model_description)
+    model.simulate(stop=[condition])
+    assert model.stoppedBy is condition and condition.message == 'Stop condition met at t=5'
+    model.simulate(stop=[TemperatureLimit(upper=1e3)])
+    assert model.stoppedBy is None
+    assert model.temperatureReadings['time'].tolist() == list(range(1, 11))
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import copy
+import numpy as np
+import pandas as pd
+import pytest
+
+import thermalmodel.links as links
+from thermalmodel.schedules import DutyCycle
+from thermalmodel.sweep import ParametricSweep
+from thermalmodel.thermalmodel import ThermalModel, setDescriptionParameter
+
+from conftest import HSN_NAMES
+
+OVERRIDES = pd.DataFrame({
+    'Battery/mass': [0.3, 0.15, 0.6],
+    'Board/BC-bottom/BC-BAT/resistance': [0.05, 0.02, 0.2],
+    'Panel/P-inner/P-BC/viewingFactor': [0.5, 0.9, 0.1],
+    'Panel/P-outer/absorptivity': [0.9, 0.2, 0.5],
+}, index=['nominal', 'light', 'heavy'])
+
+
+def test_sweep_equals_separate_runs(model_description, environment, heat_generation):
+    setDescriptionParameter(model_description, 'Panel/heatGeneration', DutyCycle(300, 30, 5))
+    sweep = ParametricSweep(600, 1, model_description, OVERRIDES,
+                            environment=environment, heat_generation=heat_generation)
+    readings = sweep.simulate()
+    for variant, row in OVERRIDES.iterrows():
+        description = copy.deepcopy(model_description)
+        for path, value in row.items():
+            setDescriptionParameter(description, path, value)
+        model = ThermalModel(600, 1, description, environment=environment, heat_generation=heat_generation)
+        model.simulate()
+        expected = model.temperatureReadings[HSN_NAMES].to_numpy()
+        variantReadings = readings[readings['variant'] == variant]
+        temperatures = variantReadings['temperature'].to_numpy().reshape(-1, len(HSN_NAMES))
+        np.testing.assert_allclose(temperatures, expected, rtol=1e-12)
+
+
+def test_sweep_requires_variants(model_description):
+    with pytest.raises(ValueError, match='at least one variant'):
+        ParametricSweep(10, 1, model_description, OVERRIDES.iloc[:0])
+
+
+def test_sweep_rejects_manual_links(model_description):
+    _, _, bottomLinks = model_description[1][2][0]
+    bottomLinks[0] = ('BC-BAT', ('Battery', 'BAT-top'), [ links.ManualLink ], { 'func': lambda: 0.0 })
+    with pytest.raises(ValueError, match='ManualLink'):
+        ParametricSweep(10, 1, model_description, OVERRIDES.drop(columns='Board/BC-bottom/BC-BAT/resistance'))
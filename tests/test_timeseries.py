@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import os
+import numpy as np
+import pytest
+
+import thermalmodel.timeseries as timeseries
+from thermalmodel.timeseries import TimeSeries
+
+VALUES = np.array([[0.5, 1.0], [1.5, 2.0], [2.5, 3.0], [3.5, 4.0], [4.5, 5.0]])
+
+
+@pytest.fixture
+def csvFile(tmp_path):
+    filename = tmp_path / 'power.csv'
+    filename.write_text('Battery,Board\n' + ''.join(f'{a},{b}\n' for a, b in VALUES))
+    return str(filename)
+
+
+@pytest.fixture
+def conversions(monkeypatch):
+    calls = []
+    convert = timeseries._convertCSV
+    monkeypatch.setattr(timeseries, '_convertCSV', lambda *args, **kwargs: calls.append(args[0]) or convert(*args, **kwargs))
+    return calls
+
+
+def test_csv_is_converted_into_a_memory_mapped_cache(csvFile, tmp_path, conversions):
+    cache = tmp_path / 'cache'
+    cache.mkdir()
+    series = TimeSeries.fromFile(csvFile, cacheDirectory=str(cache))
+    assert conversions == [csvFile]
+    assert os.path.exists(cache / 'power.csv.npy') and not os.path.exists(csvFile + '.npy')
+    assert isinstance(series.values, np.memmap)
+    assert series.columns == ['Battery', 'Board']
+    np.testing.assert_array_equal(series.values, VALUES)
+    np.testing.assert_array_equal(series.column('Board'), VALUES[:, 1])
+
+
+def test_cache_is_reused_until_the_csv_changes(csvFile, conversions):
+    TimeSeries.fromFile(csvFile)
+    TimeSeries.fromFile(csvFile, columns=['A', 'B'])
+    assert conversions == [csvFile]
+
+    with open(csvFile, 'a') as file:
+        file.write('5.5,6.0\n')
+    modified = os.path.getmtime(csvFile + '.npy') + 1
+    os.utime(csvFile, (modified, modified))
+    series = TimeSeries.fromFile(csvFile)
+    assert conversions == [csvFile, csvFile]
+    np.testing.assert_array_equal(series.values[-1], [5.5, 6.0])
+
+
+def test_conversion_streams_in_chunks(csvFile, tmp_path):
+    cache = str(tmp_path / 'chunked.npy')
+    timeseries._convertCSV(csvFile, cache, 2, chunksize=2)
+    np.testing.assert_array_equal(np.load(cache), VALUES)
+    assert not os.path.exists(cache + '.tmp')
+
+
+def test_npy_files_require_column_names(tmp_path):
+    filename = str(tmp_path / 'power.npy')
+    np.save(filename, VALUES)
+    with pytest.raises(ValueError, match='Column names are required'):
+        TimeSeries.fromFile(filename)
+    series = TimeSeries.fromFile(filename, columns=['Battery', 'Board'], sampleInterval=2)
+    assert series.duration == 10
+    np.testing.assert_array_equal(series.rows([0, 1.999, 2, 9]), [0, 0, 1, 4])
+    with pytest.raises(ValueError, match='only covers 10 seconds'):
+        series.rows([10])
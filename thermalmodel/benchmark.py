@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from time import perf_counter
+from typing import Dict, List, Sequence, Type
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from .links import ConductionLink, ContactLink, LinkType, RadiationLink
+from .thermalmodel import ThermalModel
+
+# link types of the synthetic models, and the share of links using each
+LINK_MIX: Dict[Type[LinkType], float] = {
+    ContactLink: 0.5,
+    ConductionLink: 0.3,
+    RadiationLink: 0.2,
+}
+
+# incremented whenever the content of the result files changes
+RESULTS_VERSION: int = 2
+
+# columns identifying a measurement, compared by compare()
+RESULTS_KEYS: List[str] = ['HSN', 'IFN', 'links', 'steps', 'timestep', 'ifnPerHsn', 'linksPerIfn', 'backend', 'integrator']
+
+
+def syntheticModel(hsnCount: int, ifnPerHsn: int = 4, linksPerIfn: int = 2,
+                   linkMix: Dict[Type[LinkType], float] = None, seed: int = 0) -> List:
+    """
+    Generate a `model_description` for `ThermalModel` of the given size.
+
+    Every IFN links to `linksPerIfn` randomly chosen IFN of other HSN, using one of the link types of `linkMix` (weighted by their share), with parameters in the range of the satellite models. The same arguments always produce the same model.
+    """
+    rng = np.random.default_rng(seed)
+    linkMix = LINK_MIX if linkMix is None else linkMix
+    linkTypes = list(linkMix)
+    weights = np.array([ linkMix[linkType] for linkType in linkTypes ], dtype=np.float64)
+    ifnNames = [ [ f'HSN{h}-IFN{i}' for i in range(ifnPerHsn) ] for h in range(hsnCount) ]
+
+    model_description = []
+    for h in range(hsnCount):
+        nodesIFN = []
+        for i in range(ifnPerHsn):
+            linksIFN = []
+            for n in range(linksPerIfn if hsnCount > 1 else 0):
+                target = (h + rng.integers(1, hsnCount)) % hsnCount
+                targetIFN = ifnNames[target][rng.integers(ifnPerHsn)]
+                linkType = linkTypes[rng.choice(len(linkTypes), p=weights / weights.sum())]
+                linksIFN.append((
+                    f'{ifnNames[h][i]}-L{n}', (f'HSN{target}', targetIFN),
+                    [ linkType ],
+                    _linkParameters(linkType, rng),
+                ))
+            nodesIFN.append((
+                ifnNames[h][i],
+                {
+                    'emissivity': rng.uniform(0.03, 0.9),
+                    'absorptivity': 0,
+                },
+                linksIFN,
+            ))
+        model_description.append((
+            f'HSN{h}',
+            {
+                'mass': rng.uniform(0.02, 0.5),
+                'heatCapacity': 887,
+                'heatGeneration': rng.choice([ 0, 0, 0.5, 2 ]),
+                'temperature': rng.uniform(273.15, 313.15),
+            },
+            nodesIFN,
+        ))
+    return model_description
+
+
+def _linkParameters(linkType: Type[LinkType], rng: np.random.Generator) -> Dict:
+    if issubclass(linkType, ContactLink):
+        return { 'contactArea': rng.uniform(1e-4, 3e-3), 'resistance': 0.05 }
+    if issubclass(linkType, ConductionLink):
+        return { 'conductionArea': rng.uniform(1e-5, 4e-4), 'conductivity': rng.choice([ 237, 398 ]), 'length': rng.uniform(0.05, 0.1) }
+    if issubclass(linkType, RadiationLink):
+        area = rng.uniform(1e-3, 1e-2)
+        return { 'radiationArea1': area, 'radiationArea2': area, 'viewingFactor': rng.uniform(0.2, 0.9) }
+    raise NotImplementedError(f'No synthetic parameters for {linkType.__name__}')
+
+
+def benchmark(hsnCount: int, ifnPerHsn: int = 4, linksPerIfn: int = 2, steps: int = 1000,
+              timestep: float = 1, repeat: int = 3, seed: int = 0, **options) -> Dict:
+    """
+    Measure a synthetic model of the given size (see `syntheticModel()`).
+
+    The build time (constructing and compiling the `ThermalModel`) and the steps per second of `simulate()` (running `steps` steps) are the best of `repeat` runs. The peak memory (bytes) is measured by `tracemalloc` over a separate build and simulation, whose times are discarded due to the overhead of tracing. Further `options` such as `backend` or `integrator` are passed on to `ThermalModel`.
+    """
+    duration = steps * timestep
+    buildTimes, stepRates = [], []
+    for _ in range(repeat):
+        model_description = syntheticModel(hsnCount, ifnPerHsn, linksPerIfn, seed=seed)
+        start = perf_counter()
+        model = ThermalModel(duration, timestep, model_description, **options)
+        buildTimes.append(perf_counter() - start)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = perf_counter()
+            model.simulate()
+            stepRates.append(model.engine.stepIndex / (perf_counter() - start))
+
+    model_description = syntheticModel(hsnCount, ifnPerHsn, linksPerIfn, seed=seed)
+    tracemalloc.start()
+    try:
+        model = ThermalModel(duration, timestep, model_description, **options)
+        with contextlib.redirect_stdout(io.StringIO()):
+            model.simulate()
+        _, peakMemory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'HSN': model.counters['HSN'],
+        'IFN': model.counters['IFN'],
+        'links': model.counters['links'],
+        'steps': model.engine.stepIndex,
+        'timestep': timestep,
+        'ifnPerHsn': ifnPerHsn,
+        'linksPerIfn': linksPerIfn,
+        **{ name: str(value) for name, value in options.items() },
+        'backend': model.backend,
+        'integrator': model.integratorName,
+        'build time (s)': min(buildTimes),
+        'steps/s': max(stepRates),
+        'peak memory (B)': peakMemory,
+    }
+
+
+def run(sizes: Sequence[int], **kwargs) -> pd.DataFrame:
+    """Benchmark synthetic models with each of the given numbers of HSN, see `benchmark()` for the arguments."""
+    return pd.DataFrame([ benchmark(hsnCount, **kwargs) for hsnCount in sizes ])
+
+
+def saveResults(filename: str, results: pd.DataFrame):
+    """Write the results of `run()` to a JSON file, along with the versions of the environment they were measured in."""
+    content = {
+        'version': RESULTS_VERSION,
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'results': results.to_dict(orient='records'),
+    }
+    with open(filename, 'w') as file:
+        json.dump(content, file, indent=2)
+
+
+def loadResults(filename: str) -> pd.DataFrame:
+    """Read results written by `saveResults()`."""
+    with open(filename) as file:
+        content = json.load(file)
+    if content['version'] != RESULTS_VERSION:
+        raise ValueError(f"Benchmark results '{filename}' have version {content['version']}, expected {RESULTS_VERSION}")
+    return pd.DataFrame(content['results'])
+
+
+def compare(baseline: pd.DataFrame, results: pd.DataFrame) -> pd.DataFrame:
+    """Ratios of the measurements over the baseline, for the configurations (see `RESULTS_KEYS`) present in both. Ratios of 'steps/s' below 1 and of the others above 1 are regressions."""
+    keys = [ column for column in RESULTS_KEYS if column in baseline and column in results ]
+    measures = ['build time (s)', 'steps/s', 'peak memory (B)']
+    merged = pd.merge(baseline[keys + measures], results[keys + measures], on=keys, suffixes=(' before', ' after'))
+    for measure in measures:
+        merged[measure] = merged[f'{measure} after'] / merged[f'{measure} before']
+    return merged[keys + measures]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the thermal model on synthetic models of increasing size.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help='numbers of HSN')
+    parser.add_argument('--ifn-per-hsn', type=int, default=4)
+    parser.add_argument('--links-per-ifn', type=int, default=2)
+    parser.add_argument('--steps', type=int, default=1000)
+    parser.add_argument('--timestep', type=float, default=1)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--backend', default='numpy')
+    parser.add_argument('--integrator', default='euler')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON file of earlier results to compare against')
+    args = parser.parse_args()
+
+    results = run(
+        args.sizes,
+        ifnPerHsn=args.ifn_per_hsn,
+        linksPerIfn=args.links_per_ifn,
+        steps=args.steps,
+        timestep=args.timestep,
+        repeat=args.repeat,
+        backend=args.backend,
+        integrator=args.integrator,
+    )
+    print(results.to_string(index=False))
+    if args.output:
+        saveResults(args.output, results)
+        print(f'Saving results to file {args.output}')
+    if args.compare:
+        print(compare(loadResults(args.compare), results).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from typing import Dict
+import os
+import numpy as np
+
+# incremented whenever the content of checkpoints changes
+CHECKPOINT_VERSION: int = 3
+
+
+def saveCheckpoint(filename: str, state: Dict[str, np.ndarray]):
+    """Write the state of a simulation into an uncompressed `.npz` file. The previous checkpoint is only replaced once the new one is complete."""
+    temporary = filename + '.tmp'
+    with open(temporary, 'wb') as file:
+        np.savez(file, version=np.array(CHECKPOINT_VERSION), **state)
+    os.replace(temporary, filename)
+
+
+def loadCheckpoint(filename: str) -> Dict[str, np.ndarray]:
+    """Read a checkpoint written by `saveCheckpoint()`."""
+    # plain arrays only, loading a checkpoint never runs any code
+    with np.load(filename, allow_pickle=False) as data:
+        state = { name: data[name] for name in data.files }
+    version = int(state.pop('version'))
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"Checkpoint '{filename}' has version {version}, expected {CHECKPOINT_VERSION}")
+    return state
+
+
+def prefixed(prefix: str, arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Name the arrays of a component of the state '<prefix>/<name>', such that they can be stored alongside the others."""
+    return { f'{prefix}/{name}': value for name, value in arrays.items() }
+
+
+def unprefixed(prefix: str, state: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """The arrays stored by `prefixed()`, under their original names."""
+    start = len(prefix) + 1
+    return { name[start:]: value for name, value in state.items() if name.startswith(prefix + '/') }
+
+
+def readingsType(timeType: np.dtype, countColumns: int) -> np.dtype:
+    """Record type of the readings files written by `appendReadings()`: the time and the recorded values of a reading."""
+    return np.dtype([ ('time', timeType), ('values', np.float64, (countColumns,)) ])
+
+
+def appendReadings(filename: str, start: int, times: np.ndarray, values: np.ndarray):
+    """
+    Write the readings from index `start` on into a raw binary readings file, keeping the `start` readings before them.
+
+    Checkpoints only hold the number of readings, such that every checkpoint writes the readings recorded since the previous one instead of all of them. Readings beyond `start`, written after the last complete checkpoint, are overwritten.
+    """
+    dtype = readingsType(times.dtype, values.shape[-1])
+    readings = np.empty(times.shape[0] - start, dtype=dtype)
+    readings['time'] = times[start:]
+    readings['values'] = values[start:]
+    with open(filename, 'r+b' if start and os.path.exists(filename) else 'wb') as file:
+        file.seek(start * dtype.itemsize)
+        file.truncate()
+        readings.tofile(file)
+
+
+def loadReadings(filename: str, count: int, timeType: np.dtype, countColumns: int):
+    """The first `count` times and values written by `appendReadings()`."""
+    readings = np.fromfile(filename, dtype=readingsType(timeType, countColumns), count=count)
+    if readings.shape[0] != count:
+        raise ValueError(f"Readings file '{filename}' holds {readings.shape[0]} readings, expected {count}")
+    return readings['time'], readings['values']
+
+
+def readingsFilename(checkpoint: str) -> str:
+    """Readings file belonging to a checkpoint, see `appendReadings()`."""
+    return checkpoint + '.readings'
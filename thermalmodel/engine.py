@@ -0,0 +1,626 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg
+
+from .links import ConductionLink, ContactLink, InverseLink, Link, RadiationLink
+from .recording import timeGrid
+from .schedules import Schedule
+
+if TYPE_CHECKING:
+    from .environment import OrbitEnvironment
+    from .nodes import HeatStorageNode, InterfaceNode
+    from .thermalmodel import ThermalModel
+
+
+class CompiledModel():
+
+    # arrays fully describing a compiled model, see fromArrays()
+    ARRAYS: Tuple[str, ...] = (
+        'temperature', 'capacity', 'heatGeneration',
+        'heatGenerationSeries', 'heatGenerationNodes', 'heatGenerationRows',
+        'scheduleNodes', 'scheduledHeatGeneration',
+        'ifnHSN',
+        'linearNode1', 'linearNode2', 'linearConductance',
+        'radiationNode1', 'radiationNode2', 'radiationFactor',
+        'environmentLoad', 'environmentEmission',
+    )
+
+    def __init__(self, model: ThermalModel):
+        """
+        Flattened array representation of a ThermalModel.
+
+        The HSN/IFN/link object graph is walked once and turned into NumPy arrays, such that a simulation step only consists of a handful of vectorized array operations instead of one method call per node, link and link type.
+
+        Parameters:
+
+            - model: ThermalModel
+
+                The model whose nodes and links should be compiled. The numeric IDs from `model.index` (or `model.IDmap`) are used as array indices for the HSN and IFN.
+
+        Arrays:
+
+            - temperature, capacity, heatGeneration
+
+                One entry per HSN. The capacity is `mass * heatCapacity`.
+
+            - heatGenerationSeries, heatGenerationNodes, heatGenerationRows
+
+                Only set if the model has a `heat_generation` time series, `None` otherwise. The (samples x columns) values of the series, left memory-mapped if they are, the HSN of every column, and the row used by every step. The series replaces the constant `heatGeneration` of these HSN.
+
+            - scheduleNodes, scheduledHeatGeneration
+
+                Only set if some HSN have a `schedules.Schedule` as 'heatGeneration', `None` otherwise. The indices of these HSN, and their (steps x HSN) heat generation, evaluated for every step.
+
+            - ifnHSN
+
+                One entry per IFN: the index of the owning HSN. An IFN has the temperature of its HSN, hence the links read `temperature[ifnHSN]`.
+
+            - interfaceMap
+
+                HSN x IFN sparse incidence matrix summing up the heat exchange of the IFN into their HSN.
+
+            - linearNode1, linearNode2, linearConductance
+
+                One entry per link having a `ContactLink` and/or `ConductionLink` type. The conductance (W/K) sums up all linear link types of the link.
+
+            - radiationNode1, radiationNode2, radiationFactor
+
+                One entry per link having a `RadiationLink` type. The factor (W/K^4) is multiplied with the difference of the 4th powers of the temperatures.
+
+            - environmentLoad, environmentEmission
+
+                Only set if the model has an `environment`, `None` otherwise. The (steps x IFN) heat received from the environment during every step, and the per IFN radiation factor (W/K^4) towards it (see `environment.OrbitEnvironment.loads()`). `stepIndex` counts the steps taken so far and selects the row of `environmentLoad`.
+
+        Every link is evaluated once per step: its heat flow is added to `node1` and subtracted from `node2`. The `InverseLink` mirrors generated by the model are therefore skipped. Link types other than the contact, conduction and radiation ones, i.e. `ManualLink` and any user-defined `LinkType` subclass, are kept as they are, and their `computeHeatExchange()` is called whenever the heat exchange is evaluated, after the temperatures being evaluated were copied onto the HSN objects (such that `getTemperature()` of the nodes returns them).
+
+        All array operations also accept arrays with an additional leading axis, such that several variants of the same model can be stepped at once (see `sweep.ParametricSweep`).
+
+        After changing the parameters of a node or link of the model, `updateHeatStorageNode()`, `updateInterfaceNode()` and `updateLink()` recompute only the affected entries of the arrays.
+
+        `arrays()` returns the arrays defining the compiled model, from which `fromArrays()` rebuilds it without the objects (see `modelfile`).
+        """
+        self.timestep: float = model.timestep
+        self.stepIndex: int = 0
+
+        hsnIndex = {}
+        temperature: List[float] = []
+        capacity: List[float] = []
+        heatGeneration: List[float] = []
+        schedules: List[Tuple[int, Schedule]] = []
+        for hsnID, hsn in enumerate(model.heatStorageNodes.values()):
+            hsnIndex[id(hsn)] = hsnID
+            temperature.append(hsn._temperature)
+            capacity.append(hsn.mass * hsn.heatCapacity)
+            if isinstance(hsn.heatGeneration, Schedule):
+                schedules.append((hsnID, hsn.heatGeneration))
+                heatGeneration.append(0.0)
+            else:
+                heatGeneration.append(hsn.heatGeneration)
+
+        ifnIndex = {}
+        ifnHSN: List[int] = []
+        ifnProperties: List[Tuple[float, ...]] = []
+        for hsn in model.heatStorageNodes.values():
+            for ifn in hsn.interfaces.values():
+                ifnIndex[id(ifn)] = len(ifnHSN)
+                ifnHSN.append(hsnIndex[id(hsn)])
+                ifnProperties.append(self._environmentProperties(ifn))
+
+        linear: List[Tuple[int, int, float]] = []
+        radiation: List[Tuple[int, int, float]] = []
+        # edge indices of every link, and the link type behind every radiation edge
+        self._linearEdges: Dict[int, int] = {}
+        self._radiationEdges: Dict[int, List[int]] = {}
+        self._radiationTypes: List[RadiationLink] = []
+        self.manualLinks: List[Tuple[int, int, Callable[[], float]]] = []
+        # HSN objects in the order of their IDs, kept up to date for the link types evaluated through their objects
+        self._hsnObjects: List[HeatStorageNode] = list(model.heatStorageNodes.values())
+        # number of compiled link types per LinkType subclass, see profiling.Profiler
+        self.linkTypeCounts: Dict[str, int] = {}
+        for hsn in model.heatStorageNodes.values():
+            for ifn in hsn.interfaces.values():
+                for link in ifn.interfaceLinks.values():
+                    self._compileLink(link, ifnIndex, linear, radiation)
+
+        self.temperature: np.ndarray = np.array(temperature, dtype=np.float64)
+        self.capacity: np.ndarray = np.array(capacity, dtype=np.float64)
+        self.heatGeneration: np.ndarray = np.array(heatGeneration, dtype=np.float64)
+
+        self.ifnHSN: np.ndarray = np.array(ifnHSN, dtype=np.intp)
+
+        self.linearNode1, self.linearNode2, self.linearConductance = self._edgeArrays(linear)
+        self.radiationNode1, self.radiationNode2, self.radiationFactor = self._edgeArrays(radiation)
+
+        self._hsnIndex: Dict[int, int] = hsnIndex
+        self._ifnIndex: Dict[int, int] = ifnIndex
+
+        # every step uses the inputs at the time it starts from
+        startTimes = None
+        if model.environment is not None or model.heatGenerationSeries is not None or schedules:
+            times = timeGrid(model.duration, model.timestep)
+            startTimes = np.concatenate(([0], times[:-1]))
+
+        self.heatGenerationSeries: np.ndarray = None
+        self.heatGenerationNodes: np.ndarray = None
+        self.heatGenerationRows: np.ndarray = None
+        series = model.heatGenerationSeries
+        if series is not None:
+            unknown = [ name for name in series.columns if name not in model.heatStorageNodes ]
+            if unknown:
+                raise KeyError(f'Heat generation given for unknown HSN {unknown}')
+            self.heatGenerationNodes = model.index['HSN'].IDs(series.columns)
+            self.heatGeneration[self.heatGenerationNodes] = 0
+            self.heatGenerationSeries = series.values
+            self.heatGenerationRows = series.rows(startTimes)
+            # the time series takes precedence over the HSN parameters
+            schedules = [ (hsnID, schedule) for hsnID, schedule in schedules if hsnID not in self.heatGenerationNodes ]
+
+        self.scheduleNodes: np.ndarray = None
+        self.scheduledHeatGeneration: np.ndarray = None
+        if schedules:
+            self.scheduleNodes = np.array([ hsnID for hsnID, _ in schedules ], dtype=np.intp)
+            self.scheduledHeatGeneration = np.stack([ schedule.values(startTimes) for _, schedule in schedules ], axis=-1)
+
+        self._startTimes: np.ndarray = startTimes
+        self._environment: OrbitEnvironment = model.environment
+        self.environmentLoad: np.ndarray = None
+        self.environmentEmission: np.ndarray = None
+        if model.environment is not None:
+            properties = np.array(ifnProperties, dtype=np.float64).reshape(self.countIFN, 6).T
+            self.environmentLoad, self.environmentEmission = model.environment.loads(startTimes, *properties)
+
+        self._buildDerived()
+
+    @classmethod
+    def fromArrays(cls, arrays: Dict[str, np.ndarray], timestep: float,
+                   linkTypeCounts: Dict[str, int] = None) -> CompiledModel:
+        """
+        Compiled model made of the given arrays (see `ARRAYS` and `arrays()`), without any HSN/IFN/link objects behind it.
+
+        Such a model simulates like the one the arrays were taken from, but cannot be updated with `updateHeatStorageNode()`, `updateInterfaceNode()` or `updateLink()`.
+        """
+        engine = cls.__new__(cls)
+        engine.timestep = timestep
+        engine.stepIndex = 0
+        for name in cls.ARRAYS:
+            setattr(engine, name, arrays.get(name, None))
+        engine.manualLinks = []
+        engine._hsnObjects = []
+        engine.linkTypeCounts = dict(linkTypeCounts or {})
+        engine._hsnIndex = {}
+        engine._ifnIndex = {}
+        engine._linearEdges = {}
+        engine._radiationEdges = {}
+        engine._radiationTypes = []
+        engine._startTimes = None
+        engine._environment = None
+        engine._buildDerived()
+        return engine
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """The arrays defining the compiled model (see `ARRAYS`), leaving out the unset ones."""
+        if self.manualLinks:
+            raise ValueError('Models with ManualLink functions or custom link types cannot be represented by arrays only')
+        return { name: getattr(self, name) for name in self.ARRAYS if getattr(self, name) is not None }
+
+    def _buildDerived(self):
+        # structures derived from the arrays, rebuilt by fromArrays()
+        countHSN, countIFN = self.countHSN, self.countIFN
+        self.interfaceMap: sparse.csr_matrix = sparse.csr_matrix(
+            (np.ones(countIFN), (self.ifnHSN, np.arange(countIFN))),
+            shape=(countHSN, countIFN),
+        )
+        self._interfaceTemperatureJacobian: sparse.csr_matrix = self.interfaceMap.T.tocsr()
+
+    def _compileLink(self, link: Link, ifnIndex: dict,
+                     linear: List[Tuple[int, int, float]],
+                     radiation: List[Tuple[int, int, float]]):
+        node1 = ifnIndex[id(link.node1)]
+        node2 = ifnIndex[id(link.node2)]
+        conductance = 0.0
+        hasLinear = False
+        for linkType in link.linkTypes:
+            if not isinstance(linkType, InverseLink):
+                name = type(linkType).__name__
+                self.linkTypeCounts[name] = self.linkTypeCounts.get(name, 0) + 1
+            if isinstance(linkType, (ContactLink, ConductionLink)):
+                conductance += linkType._conductance
+                hasLinear = True
+            elif isinstance(linkType, RadiationLink):
+                self._radiationEdges.setdefault(id(link), []).append(len(radiation))
+                self._radiationTypes.append(linkType)
+                radiation.append((node1, node2, linkType._radiationFactor))
+            elif isinstance(linkType, InverseLink):
+                # accounted for by the mirrored link
+                continue
+            else:
+                # ManualLink and link types unknown to the compiler, evaluated through their objects
+                self.manualLinks.append((node1, node2, linkType.computeHeatExchange))
+        if hasLinear:
+            self._linearEdges[id(link)] = len(linear)
+            linear.append((node1, node2, conductance))
+
+    @staticmethod
+    def _environmentProperties(ifn: InterfaceNode) -> Tuple[float, ...]:
+        # in the order of the arguments of OrbitEnvironment.loads()
+        return (
+            ifn._area, ifn._absorptivity, ifn._emissivity,
+            ifn._sunAccess, ifn._earthAccess, ifn._spaceAccess,
+        )
+
+    @staticmethod
+    def _edgeArrays(edges: List[Tuple[int, int, float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if not edges:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+        node1, node2, coefficient = zip(*edges)
+        return (
+            np.array(node1, dtype=np.intp),
+            np.array(node2, dtype=np.intp),
+            np.array(coefficient, dtype=np.float64),
+        )
+
+    @property
+    def countHSN(self) -> int:
+        return self.capacity.shape[-1]
+
+    @property
+    def countIFN(self) -> int:
+        return self.ifnHSN.shape[0]
+
+    def interfaceTemperature(self, temperature: np.ndarray) -> np.ndarray:
+        """Temperatures seen by the links for the given HSN temperatures."""
+        # the IFN follow their HSN, see InterfaceNode.getTemperature()
+        return temperature[..., self.ifnHSN]
+
+    def interfaceTemperatureJacobian(self) -> sparse.csr_matrix:
+        """IFN x HSN derivative of `interfaceTemperature()` with respect to the HSN temperatures."""
+        return self._interfaceTemperatureJacobian
+
+    def interfaceHeatExchange(self, temperature: np.ndarray, stepIndex: int = None,
+                              environmentLoad: np.ndarray = None) -> np.ndarray:
+        """Heat exchange (W) of every IFN through its links and with the environment during the given step, the current `stepIndex` by default. A given `environmentLoad` replaces the environment loads of the step, e.g. interpolated within it."""
+        ifnT = self.interfaceTemperature(temperature)
+        heat = np.zeros(ifnT.shape)
+        self._addLinearLinks(heat, ifnT)
+        self._addRadiationLinks(heat, ifnT)
+        self._addManualLinks(heat, temperature)
+        self._addEnvironment(heat, ifnT, stepIndex, environmentLoad)
+        return heat
+
+    def _addLinearLinks(self, heat: np.ndarray, ifnT: np.ndarray):
+        q = -self.linearConductance * (ifnT[..., self.linearNode1] - ifnT[..., self.linearNode2])
+        heat += self._scatter(self.linearNode1, q, self.countIFN)
+        heat -= self._scatter(self.linearNode2, q, self.countIFN)
+
+    def _addRadiationLinks(self, heat: np.ndarray, ifnT: np.ndarray):
+        ifnT4 = ifnT**4
+        q = -self.radiationFactor * (ifnT4[..., self.radiationNode1] - ifnT4[..., self.radiationNode2])
+        heat += self._scatter(self.radiationNode1, q, self.countIFN)
+        heat -= self._scatter(self.radiationNode2, q, self.countIFN)
+
+    @staticmethod
+    def _scatter(index: np.ndarray, values: np.ndarray, length: int) -> np.ndarray:
+        # sum up values[..., i] into result[..., index[i]]
+        if values.ndim == 1:
+            return np.bincount(index, weights=values, minlength=length)
+        rows = values.shape[0]
+        flatIndex = index + length * np.arange(rows)[:, np.newaxis]
+        return np.bincount(flatIndex.ravel(), weights=values.ravel(), minlength=rows * length).reshape(rows, length)
+
+    def _addManualLinks(self, heat: np.ndarray, temperature: np.ndarray):
+        if not self.manualLinks:
+            return
+        # the functions read the temperatures from the node objects
+        for hsn, hsnTemperature in zip(self._hsnObjects, temperature):
+            hsn._temperature = float(hsnTemperature)
+        for node1, node2, func in self.manualLinks:
+            q = func()
+            heat[..., node1] += q
+            heat[..., node2] -= q
+
+    def _addEnvironment(self, heat: np.ndarray, ifnT: np.ndarray, stepIndex: int = None,
+                        environmentLoad: np.ndarray = None):
+        if self.environmentLoad is None:
+            return
+        if environmentLoad is None:
+            if stepIndex is None:
+                stepIndex = self.stepIndex
+            # the loads are precomputed for the simulation duration; hold the last ones beyond it
+            environmentLoad = self.environmentLoad[min(stepIndex, self.environmentLoad.shape[0] - 1)]
+        heat += environmentLoad
+        heat -= self.environmentEmission * ifnT**4
+
+    def _addHeatGeneration(self, heat: np.ndarray, stepIndex: int = None):
+        heat += self.heatGeneration
+        if self.heatGenerationSeries is None and self.scheduledHeatGeneration is None:
+            return
+        if stepIndex is None:
+            stepIndex = self.stepIndex
+        if self.heatGenerationSeries is not None:
+            row = self.heatGenerationRows[min(stepIndex, self.heatGenerationRows.shape[0] - 1)]
+            heat[..., self.heatGenerationNodes] += self.heatGenerationSeries[row]
+        if self.scheduledHeatGeneration is not None:
+            row = min(stepIndex, self.scheduledHeatGeneration.shape[0] - 1)
+            heat[..., self.scheduleNodes] += self.scheduledHeatGeneration[row]
+
+    def loadChanges(self) -> np.ndarray:
+        """
+        Indices of the steps at which the time-varying loads change abruptly: those whose heat generation series or schedules differ from the previous step, and those at which the environment enters or leaves an eclipse.
+
+        In between, the environment loads follow the orbit smoothly, and may be interpolated between the steps.
+        """
+        changes = np.empty(0, dtype=np.intp)
+        loads = []
+        if self.heatGenerationSeries is not None:
+            loads.append(self.heatGenerationSeries[self.heatGenerationRows])
+        if self.scheduledHeatGeneration is not None:
+            loads.append(self.scheduledHeatGeneration)
+        for values in loads:
+            values = values.reshape(values.shape[0], -1)
+            changes = np.union1d(changes, np.flatnonzero(np.any(values[1:] != values[:-1], axis=1)) + 1)
+        if self.environmentLoad is not None:
+            values = self.environmentLoad.reshape(self.environmentLoad.shape[0], -1)
+            # the sunlit loads come on top of those remaining in eclipse, see OrbitEnvironment.loads()
+            eclipse = np.all(values == values.min(axis=0), axis=1)
+            changes = np.union1d(changes, np.flatnonzero(eclipse[1:] != eclipse[:-1]) + 1)
+        return changes
+
+    def heatExchange(self, temperature: np.ndarray, stepIndex: int = None,
+                     environmentLoad: np.ndarray = None) -> np.ndarray:
+        """Net heat (W) going into every HSN during the given step (see `interfaceHeatExchange()`), including its heat generation."""
+        heat = self._scatter(self.ifnHSN, self.interfaceHeatExchange(temperature, stepIndex, environmentLoad), self.countHSN)
+        self._addHeatGeneration(heat, stepIndex)
+        return heat
+
+    def jacobian(self, temperature: np.ndarray) -> sparse.csr_matrix:
+        """
+        HSN x HSN derivative of `heatExchange()` with respect to the HSN temperatures.
+
+        The radiation links and the radiation to the environment are linearized around the given temperatures. `ManualLink` functions are opaque and therefore left out.
+        """
+        ifnT = self.interfaceTemperature(temperature)
+        n1, n2 = self.linearNode1, self.linearNode2
+        r1, r2 = self.radiationNode1, self.radiationNode2
+        c = self.linearConductance
+        r = 4 * self.radiationFactor
+        d1 = r * ifnT[r1]**3
+        d2 = r * ifnT[r2]**3
+        if self.environmentEmission is None:
+            e, de = np.empty(0, dtype=np.intp), np.empty(0)
+        else:
+            e, de = np.arange(self.countIFN), -4 * self.environmentEmission * ifnT**3
+        ifnJacobian = sparse.csr_matrix(
+            (
+                np.concatenate((-c, c, c, -c, -d1, d2, d1, -d2, de)),
+                (
+                    np.concatenate((n1, n1, n2, n2, r1, r1, r2, r2, e)),
+                    np.concatenate((n1, n2, n1, n2, r1, r2, r1, r2, e)),
+                ),
+            ),
+            shape=(self.countIFN, self.countIFN),
+        )
+        return (self.interfaceMap @ ifnJacobian @ self.interfaceTemperatureJacobian()).tocsr()
+
+    def _objectLinkJacobian(self, temperature: np.ndarray) -> sparse.csr_matrix:
+        # forward differences of the heat exchanged through the links evaluated by their objects,
+        # perturbing the HSN these links are attached to
+        if not self.manualLinks:
+            return sparse.csr_matrix((self.countHSN, self.countHSN))
+
+        def objectLinkHeat(hsnT: np.ndarray) -> np.ndarray:
+            heat = np.zeros(self.countIFN)
+            self._addManualLinks(heat, hsnT)
+            return self._scatter(self.ifnHSN, heat, self.countHSN)
+
+        ends = [ node for node1, node2, _ in self.manualLinks for node in (node1, node2) ]
+        columns = np.unique(self.ifnHSN[ends])
+        base = objectLinkHeat(temperature)
+        derivatives = []
+        for column in columns:
+            perturbed = temperature.copy()
+            perturbation = 1e-6 * max(1.0, abs(temperature[column]))
+            perturbed[column] += perturbation
+            derivatives.append((objectLinkHeat(perturbed) - base) / perturbation)
+        rows, columnIndex = np.meshgrid(np.arange(self.countHSN), columns, indexing='ij')
+        return sparse.csr_matrix(
+            (np.stack(derivatives, axis=-1).ravel(), (rows.ravel(), columnIndex.ravel())),
+            shape=(self.countHSN, self.countHSN),
+        )
+
+    def steadyState(self, temperature: np.ndarray = None, stepIndex: int = None,
+                    tolerance: float = 1e-6, heatTolerance: float = 1e-6, maxIterations: int = 100) -> np.ndarray:
+        """
+        HSN temperatures for which no net heat goes into any HSN, with the loads of the given step.
+
+        Solved with Newton's method from the given temperatures (the current ones by default), using the sparse Jacobian of the heat exchange. The columns of the links evaluated through their objects (`ManualLink` and custom link types), which `jacobian()` leaves out, are estimated by finite differences. Steps are halved as long as they do not reduce the residual heat, such that the strongly nonlinear radiation does not throw the iteration off; a RuntimeError is raised if no step reduces it. Stops once no HSN has a residual heat above `heatTolerance` (W), and the next step would change no temperature by more than `tolerance` (K).
+        """
+        temperature = np.array(self.temperature if temperature is None else temperature, dtype=np.float64)
+        # the ManualLink functions are evaluated on the HSN objects, which keep their temperatures
+        hsnTemperatures = [ hsn._temperature for hsn in self._hsnObjects ]
+        try:
+            residual = self.heatExchange(temperature, stepIndex)
+            for _ in range(maxIterations):
+                jacobian = self.jacobian(temperature) + self._objectLinkJacobian(temperature)
+                try:
+                    lu = linalg.splu(sparse.csc_matrix(jacobian))
+                    delta = lu.solve(-residual)
+                    # without a sink, the Jacobian is singular up to rounding errors
+                    pivots = np.abs(lu.U.diagonal())
+                    singular = pivots.min() <= 1e-12 * pivots.max()
+                except RuntimeError:
+                    singular = True
+                if singular or not np.all(np.isfinite(delta)):
+                    raise RuntimeError(
+                        'Singular Jacobian: the model has no unique steady state, '
+                        'e.g. because some HSN exchange no heat with any sink'
+                    )
+                norm = np.max(np.abs(residual))
+                if norm < heatTolerance and np.max(np.abs(delta)) < tolerance:
+                    return temperature
+                scale = 1.0
+                while True:
+                    candidate = temperature + scale * delta
+                    candidateResidual = self.heatExchange(candidate, stepIndex)
+                    if np.all(candidate > 0) and np.max(np.abs(candidateResidual)) <= norm:
+                        break
+                    scale /= 2
+                    if scale < 1e-6:
+                        raise RuntimeError(
+                            f'Steady state line search failed: no step reduces the residual heat of {norm:.3g} W, '
+                            'e.g. because some link exchanges heat discontinuously'
+                        )
+                temperature, residual = candidate, candidateResidual
+            raise RuntimeError(f'Steady state did not converge within {maxIterations} iterations')
+        finally:
+            for hsn, hsnTemperature in zip(self._hsnObjects, hsnTemperatures):
+                hsn._temperature = hsnTemperature
+
+    def step(self) -> np.ndarray:
+        """Advance all HSN temperatures by one timestep (forward Euler)."""
+        self.temperature += self.heatExchange(self.temperature) * self.timestep / self.capacity
+        self.stepIndex += 1
+        return self.temperature
+
+    def _setLinearConductance(self, edge: int, conductance: float):
+        self.linearConductance[edge] = conductance
+
+    def _setRadiationFactor(self, edge: int, factor: float):
+        self.radiationFactor[edge] = factor
+
+    def updateHeatStorageNode(self, hsn: HeatStorageNode):
+        """Recompute the capacity and the constant heat generation of an HSN after its parameters changed."""
+        hsnID = self._hsnIndex[id(hsn)]
+        self.capacity[hsnID] = hsn.mass * hsn.heatCapacity
+        if isinstance(hsn.heatGeneration, Schedule):
+            # evaluated upon compilation, see scheduledHeatGeneration
+            return
+        if self.heatGenerationNodes is None or hsnID not in self.heatGenerationNodes:
+            self.heatGeneration[hsnID] = hsn.heatGeneration
+
+    def updateInterfaceNode(self, ifn: InterfaceNode):
+        """Recompute the radiation links of an IFN and its environment loads after its parameters changed."""
+        ifnID = self._ifnIndex[id(ifn)]
+        for edge in np.flatnonzero((self.radiationNode1 == ifnID) | (self.radiationNode2 == ifnID)):
+            linkType = self._radiationTypes[edge]
+            linkType.invalidate()
+            self._setRadiationFactor(edge, linkType._radiationFactor)
+        if self.environmentLoad is not None:
+            properties = np.array(self._environmentProperties(ifn))[:, np.newaxis]
+            load, emission = self._environment.loads(self._startTimes, *properties)
+            self.environmentLoad[:, ifnID] = load[:, 0]
+            self.environmentEmission[ifnID] = emission[0]
+
+    def updateLink(self, link: Link):
+        """Recompute the coefficients of a link after its parameters changed."""
+        link.invalidate()
+        if id(link) in self._linearEdges:
+            conductance = sum(
+                linkType._conductance for linkType in link.linkTypes
+                if isinstance(linkType, (ContactLink, ConductionLink))
+            )
+            self._setLinearConductance(self._linearEdges[id(link)], conductance)
+        for edge in self._radiationEdges.get(id(link), []):
+            self._setRadiationFactor(edge, self._radiationTypes[edge]._radiationFactor)
+
+    def writeBack(self, model: ThermalModel):
+        """Copy the compiled temperatures back onto the HSN objects of the model."""
+        for hsn, temperature in zip(model.heatStorageNodes.values(), self.temperature):
+            hsn._temperature = float(temperature)
+
+
+class SparseCompiledModel(CompiledModel):
+
+    def __init__(self, model: ThermalModel):
+        """
+        Compiled model evaluating the links through sparse matrices.
+
+        Meant for large models with thousands of sparsely connected IFN. The cost of a step scales with the number of links rather than with the square of the number of nodes.
+
+        Every kind of link is represented by two CSR matrices: a links x IFN difference matrix giving `x[node1] - x[node2]` for every link, and an IFN x links matrix holding the link coefficients, which adds the resulting heat flow to `node1` and subtracts it from `node2`. Keeping the difference separate ensures that links between nodes of equal temperature exchange exactly no heat.
+
+        Matrices:
+
+            - linearDifference, linearMatrix: scipy.sparse.csr_matrix
+
+                Contact/conduction conductances, applied to the temperatures.
+
+            - radiationCouplings: scipy.sparse.coo_matrix
+
+                IFN x IFN edge list of the radiation factors, the entry (i, j) being the factor of a link from IFN i to IFN j.
+
+            - radiationDifference, radiationMatrix: scipy.sparse.csr_matrix
+
+                Radiation factors taken from `radiationCouplings`, applied to the 4th powers of the temperatures.
+        """
+        super().__init__(model)
+
+    def _buildDerived(self):
+        super()._buildDerived()
+        countIFN = self.countIFN
+        self.linearDifference, self.linearMatrix = self._exchangeMatrices(
+            self.linearNode1, self.linearNode2, self.linearConductance,
+        )
+        self.radiationCouplings: sparse.coo_matrix = sparse.coo_matrix(
+            (self.radiationFactor, (self.radiationNode1, self.radiationNode2)),
+            shape=(countIFN, countIFN),
+        )
+        self.radiationDifference, self.radiationMatrix = self._exchangeMatrices(
+            self.radiationCouplings.row, self.radiationCouplings.col, self.radiationCouplings.data,
+        )
+
+    def _exchangeMatrices(self, node1: np.ndarray, node2: np.ndarray,
+                          coefficient: np.ndarray) -> Tuple[sparse.csr_matrix, sparse.csr_matrix]:
+        countIFN = self.countIFN
+        countLinks = coefficient.shape[0]
+        links = np.arange(countLinks)
+        difference = sparse.csr_matrix(
+            (np.concatenate((np.ones(countLinks), -np.ones(countLinks))),
+             (np.concatenate((links, links)), np.concatenate((node1, node2)))),
+            shape=(countLinks, countIFN),
+        )
+        exchange = sparse.csr_matrix(
+            (np.concatenate((-coefficient, coefficient)),
+             (np.concatenate((node1, node2)), np.concatenate((links, links)))),
+            shape=(countIFN, countLinks),
+        )
+        return difference, exchange
+
+    def _setLinearConductance(self, edge: int, conductance: float):
+        super()._setLinearConductance(edge, conductance)
+        self._setExchangeEntries(self.linearMatrix, self.linearNode1[edge], self.linearNode2[edge], edge, conductance)
+
+    def _setRadiationFactor(self, edge: int, factor: float):
+        super()._setRadiationFactor(edge, factor)
+        self.radiationCouplings.data[edge] = factor
+        self._setExchangeEntries(self.radiationMatrix, self.radiationNode1[edge], self.radiationNode2[edge], edge, factor)
+
+    @staticmethod
+    def _setExchangeEntries(matrix: sparse.csr_matrix, node1: int, node2: int, edge: int, coefficient: float):
+        # the entries exist already, the sparsity structure is left untouched
+        if node1 == node2:
+            # both entries were summed up into an exact zero
+            return
+        matrix[node1, edge] = -coefficient
+        matrix[node2, edge] = coefficient
+
+    def _addLinearLinks(self, heat: np.ndarray, ifnT: np.ndarray):
+        heat += self.linearMatrix @ (self.linearDifference @ ifnT)
+
+    def _addRadiationLinks(self, heat: np.ndarray, ifnT: np.ndarray):
+        heat += self.radiationMatrix @ (self.radiationDifference @ ifnT**4)
+
+    def heatExchange(self, temperature: np.ndarray, stepIndex: int = None,
+                     environmentLoad: np.ndarray = None) -> np.ndarray:
+        heat = self.interfaceMap @ self.interfaceHeatExchange(temperature, stepIndex, environmentLoad)
+        self._addHeatGeneration(heat, stepIndex)
+        return heat
+
+
+BACKENDS = {
+    'numpy': CompiledModel,
+    'sparse': SparseCompiledModel,
+}
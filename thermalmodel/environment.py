@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from typing import Tuple
+import numpy as np
+
+from .timeseries import TimeSeries
+
+BOLTZMANN: float = 5.670374419e-8  # W/(m^2 K^4)
+EARTH_RADIUS: float = 6371e3  # m
+
+
+class OrbitEnvironment():
+
+    def __init__(self, elevation: np.ndarray,
+                 sampleInterval: float = 1,
+                 solarIrradiance: float = 1344,
+                 surfaceInfrared: float = 237,
+                 altitude: float = 500e3,
+                 albedo: float = 0,
+                 spaceTemperature: float = 3,
+                 earthTemperature: float = 303):
+        """
+        External heat loads of a satellite in orbit, as computed per IFN and timestep by the original script.
+
+        Every IFN facing the environment receives
+
+            q_sun    = sunAccess * absorptivity * solarIrradiance * area * |sin(elevation)|
+            q_albedo = earthAccess * absorptivity * albedo * solarIrradiance * area * |sin(elevation)|
+            q_ir     = earthAccess * emissivity * area * earthInfrared
+
+        and radiates towards deep space and the Earth
+
+            q_space = -spaceAccess * emissivity * sigma * area * (T^4 - spaceTemperature^4)
+            q_earth = -earthAccess * emissivity * sigma * area * (T^4 - earthTemperature^4)
+
+        The IFN take `area`, `sunAccess`, `earthAccess` and `spaceAccess` from their parameters, all of which default to 0 (i.e. no contact with the environment).
+
+        Everything not depending on the temperature is precomputed for the whole simulation by `loads()`, as one (steps x IFN) array.
+
+        Parameters:
+
+            - elevation: numpy.ndarray
+
+                Sun elevation (degrees) over the orbit, see `fromCSV()`. Past its end, the profile repeats itself.
+
+            - sampleInterval: float
+
+                Seconds between two elevation samples. The elevation is linearly interpolated at the simulation times.
+
+            - solarIrradiance: float
+
+                Solar flux (W/m^2).
+
+            - surfaceInfrared, altitude: float
+
+                Infrared flux emitted by the Earth (W/m^2) at its surface, and orbit altitude (m). The flux received in orbit (`earthInfrared`) is scaled down by the ratio of the spheres' surfaces.
+
+            - albedo: float
+
+                Fraction of the solar flux reflected by the Earth. The original script neglects it, hence 0 by default; ~0.3 is a typical value.
+
+            - spaceTemperature, earthTemperature: float
+
+                Radiative sink temperatures (K).
+
+        Methods:
+
+            - fromCSV(filename, cacheDirectory)
+            - elevationAt(times)
+            - loads(times, area, absorptivity, emissivity, sunAccess, earthAccess, spaceAccess)
+        """
+        self.elevation: np.ndarray = np.asarray(elevation, dtype=np.float64)
+        self.sampleInterval: float = sampleInterval
+        self.solarIrradiance: float = solarIrradiance
+        self.earthInfrared: float = surfaceInfrared * (EARTH_RADIUS / (EARTH_RADIUS + altitude))**2
+        self.albedo: float = albedo
+        self.spaceTemperature: float = spaceTemperature
+        self.earthTemperature: float = earthTemperature
+
+    @classmethod
+    def fromCSV(cls, filename: str, cacheDirectory: str = None, **kwargs) -> OrbitEnvironment:
+        """Read the elevation profile from the first column of a CSV file, such as `old-script/input/ele.csv`, through the binary cache of `timeseries.TimeSeries.fromFile()` (kept in `cacheDirectory` if given). Further arguments are passed on to the constructor."""
+        return cls(TimeSeries.fromFile(filename, columns=['elevation'], cacheDirectory=cacheDirectory).values[:, 0], **kwargs)
+
+    def elevationAt(self, times: np.ndarray) -> np.ndarray:
+        """Sun elevation (degrees) at the given times (s)."""
+        samples = np.arange(self.elevation.shape[0]) * self.sampleInterval
+        return np.interp(times, samples, self.elevation, period=samples[-1] + self.sampleInterval)
+
+    def loads(self, times: np.ndarray, area: np.ndarray, absorptivity: np.ndarray, emissivity: np.ndarray,
+              sunAccess: np.ndarray, earthAccess: np.ndarray, spaceAccess: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Precompute the environment loads of the IFN, given their properties as arrays.
+
+        Returns the (times x IFN) heat (W) received independently of the temperature, and the per IFN factor (W/K^4) of the radiation to space and Earth, which is to be multiplied with the 4th power of the IFN temperature and subtracted.
+        """
+        sun = np.abs(np.sin(np.radians(self.elevationAt(times))))
+        sunlit = absorptivity * area * (sunAccess + self.albedo * earthAccess) * self.solarIrradiance
+        emission = BOLTZMANN * emissivity * area * (spaceAccess + earthAccess)
+        constant = (
+            earthAccess * emissivity * area * self.earthInfrared
+            + BOLTZMANN * emissivity * area * (
+                spaceAccess * self.spaceTemperature**4 + earthAccess * self.earthTemperature**4
+            )
+        )
+        return np.outer(sun, sunlit) + constant, emission
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from typing import Dict, Type
+import numpy as np
+from scipy import integrate, sparse
+from scipy.sparse import linalg
+
+from .engine import CompiledModel
+
+
+class Integrator():
+
+    def __init__(self, engine: CompiledModel, options: Dict):
+        """
+        Advances the HSN temperatures of a compiled model in time.
+
+        Parameters:
+
+            - engine: CompiledModel
+
+                The compiled model whose `temperature` array is advanced in place.
+
+            - options: Dict
+
+                Integrator specific settings, see the respective subclass.
+        """
+        self.engine: CompiledModel = engine
+        self.options: Dict = options
+
+    def step(self) -> np.ndarray:
+        raise NotImplementedError()
+
+    def invalidate(self):
+        """Drop everything derived from the coefficients of the engine, after they changed."""
+        pass
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """Arrays from which `restore()` continues the integration exactly, see `checkpoint`. Integrators keeping state between steps add it."""
+        return {}
+
+    def restore(self, snapshot: Dict[str, np.ndarray]):
+        pass
+
+
+class ExplicitEuler(Integrator):
+
+    def step(self) -> np.ndarray:
+        return self.engine.step()
+
+
+class ImplicitIntegrator(Integrator):
+
+    theta: float = 1
+
+    def __init__(self, engine: CompiledModel, options: Dict):
+        """
+        Linearized implicit theta-method, allowing for much larger timesteps on stiff models.
+
+        Every step solves
+
+            (C/dt - theta * J) * deltaT = Q(T)
+
+        where `C` are the HSN capacities, `Q` the net heat going into the HSN and `J` its Jacobian, with the radiation linearized around the current temperatures. The sparse LU factorization of the left-hand side is cached, and only recomputed once any temperature moved more than `jacobianTolerance` away from the temperatures it was computed for. Models without any radiation, through links or to the environment, are factorized only once.
+
+        Options:
+
+            - jacobianTolerance: float
+
+                Temperature change (K) after which the factorization is recomputed. Defaults to 1.
+        """
+        super().__init__(engine, options)
+        self.jacobianTolerance: float = options.get('jacobianTolerance', 1)
+        self._linear: bool = engine.radiationFactor.size == 0 and engine.environmentEmission is None
+        self._factorTemperature: np.ndarray = np.empty(0)
+        self._lu: linalg.SuperLU = None
+
+    def _factorize(self, temperature: np.ndarray):
+        engine = self.engine
+        lhs = sparse.diags(engine.capacity / engine.timestep) - self.theta * engine.jacobian(temperature)
+        self._lu = linalg.splu(sparse.csc_matrix(lhs))
+        self._factorTemperature = temperature.copy()
+
+    def invalidate(self):
+        self._lu = None
+
+    def _needsFactorization(self, temperature: np.ndarray) -> bool:
+        if self._lu is None:
+            return True
+        if self._linear:
+            return False
+        return np.max(np.abs(temperature - self._factorTemperature)) > self.jacobianTolerance
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        # the factorization is recomputed from the temperatures it was computed for
+        if self._lu is None:
+            return {}
+        return { 'factorTemperature': self._factorTemperature }
+
+    def restore(self, snapshot: Dict[str, np.ndarray]):
+        if 'factorTemperature' in snapshot:
+            self._factorize(snapshot['factorTemperature'])
+
+    def step(self) -> np.ndarray:
+        engine = self.engine
+        temperature = engine.temperature
+        if self._needsFactorization(temperature):
+            self._factorize(temperature)
+        temperature += self._lu.solve(engine.heatExchange(temperature))
+        engine.stepIndex += 1
+        return temperature
+
+
+class BackwardEuler(ImplicitIntegrator):
+    theta: float = 1
+
+
+class CrankNicolson(ImplicitIntegrator):
+    theta: float = 0.5
+
+
+ADAPTIVE_METHODS: Dict[str, Type[integrate.OdeSolver]] = {
+    'RK23': integrate.RK23,
+    'RK45': integrate.RK45,
+    'DOP853': integrate.DOP853,
+    'Radau': integrate.Radau,
+    'BDF': integrate.BDF,
+    'LSODA': integrate.LSODA,
+}
+
+
+class AdaptiveIntegrator(Integrator):
+
+    def __init__(self, engine: CompiledModel, options: Dict):
+        """
+        Variable step size integration with error control, using one of the solvers behind `scipy.integrate.solve_ivp`.
+
+        The solver takes internal steps as large as the tolerances allow, growing during thermally quiet phases. Heat generation schedules and time series are constant over every `timestep`, and the solver is stopped and restarted at every step at which they change, or at which the orbit enters or leaves an eclipse (see `CompiledModel.loadChanges()`), such that it never steps over sudden changes like power-on events. In between, the environment loads are interpolated linearly between the steps, such that the solver sees them vary continuously along the orbit and can take steps spanning many timesteps. Each call to `step()` still advances by exactly one `timestep`, interpolating the temperatures from the solver's dense output, such that the readings remain on the fixed time grid.
+
+        Options:
+
+            - method: str
+
+                Name of the solver, one of 'RK23', 'RK45', 'DOP853' (embedded Runge-Kutta pairs) or 'Radau', 'BDF', 'LSODA' (implicit, given the Jacobian of the model). Defaults to 'LSODA', which switches between non-stiff and stiff methods as needed.
+
+            - rtol, atol: float
+
+                Relative and absolute (K) tolerances of the local error. Default to 1e-6 and 1e-4.
+
+            - maxStep: float
+
+                Upper bound for the internal step size (s). Unbounded by default, changes of the loads are never stepped over either way.
+        """
+        super().__init__(engine, options)
+        self.method: str = options.get('method', 'LSODA')
+        if self.method not in ADAPTIVE_METHODS:
+            raise ValueError(f"Unknown method '{self.method}', expected one of {list(ADAPTIVE_METHODS)}")
+        self.rtol: float = options.get('rtol', 1e-6)
+        self.atol: float = options.get('atol', 1e-4)
+        self.maxStep: float = options.get('maxStep', np.inf)
+
+        self._solver: integrate.OdeSolver = None
+        self._interpolant: integrate.DenseOutput = None
+        self._loadChanges: np.ndarray = None
+        # step whose loads hold until the solver stops, and the environment loads
+        # of the steps up to there, see _createSolver()
+        self._loadStep: int = 0
+        self._environmentLoad: np.ndarray = None
+
+    def _environmentLoadAt(self, time: float) -> np.ndarray:
+        loads = self._environmentLoad
+        if loads is None:
+            return None
+        # the loads of a step hold at its start, the last one until the solver stops
+        position = min(max(time / self.engine.timestep - self._loadStep, 0), loads.shape[0] - 1)
+        row = min(int(position), loads.shape[0] - 2)
+        if row < 0:
+            return loads[0]
+        fraction = position - row
+        return (1 - fraction) * loads[row] + fraction * loads[row + 1]
+
+    def _temperatureRate(self, time: float, temperature: np.ndarray) -> np.ndarray:
+        return self.engine.heatExchange(temperature, self._loadStep, self._environmentLoadAt(time)) / self.engine.capacity
+
+    def _temperatureRateJacobian(self, time: float, temperature: np.ndarray):
+        jacobian = sparse.diags(1 / self.engine.capacity) @ self.engine.jacobian(temperature)
+        if self.method == 'LSODA':
+            return jacobian.toarray()
+        return jacobian
+
+    def _createSolver(self) -> integrate.OdeSolver:
+        engine = self.engine
+        if self._loadChanges is None:
+            self._loadChanges = engine.loadChanges()
+        # integrate with the loads of the current step, up to the next step changing them
+        self._loadStep = engine.stepIndex
+        changes = self._loadChanges[self._loadChanges > engine.stepIndex]
+        bound = changes[0] * engine.timestep if changes.size else np.inf
+        if engine.environmentLoad is not None:
+            # beyond the simulation duration, the last loads hold
+            first = min(engine.stepIndex, engine.environmentLoad.shape[0] - 1)
+            end = changes[0] if changes.size else engine.environmentLoad.shape[0]
+            self._environmentLoad = engine.environmentLoad[first:max(end, first + 1)]
+        extra = {}
+        if self.method in ('Radau', 'BDF', 'LSODA'):
+            extra['jac'] = self._temperatureRateJacobian
+        return ADAPTIVE_METHODS[self.method](
+            self._temperatureRate, engine.stepIndex * engine.timestep, engine.temperature.copy(), bound,
+            rtol=self.rtol, atol=self.atol, max_step=self.maxStep, **extra,
+        )
+
+    def invalidate(self):
+        # restart from the current time and temperatures
+        self._solver = None
+        self._loadChanges = None
+
+    def step(self) -> np.ndarray:
+        engine = self.engine
+        if self._solver is None or self._solver.status == 'finished':
+            # the loads change from this step on
+            self._solver = self._createSolver()
+        solver = self._solver
+        target = (engine.stepIndex + 1) * engine.timestep
+        if solver.t < target:
+            while solver.t < target:
+                message = solver.step()
+                if solver.status == 'failed':
+                    raise RuntimeError(f'Adaptive integration failed at t={solver.t}: {message}')
+            self._interpolant = solver.dense_output()
+        engine.temperature[:] = self._interpolant(target)
+        engine.stepIndex += 1
+        return engine.temperature
+
+
+INTEGRATORS: Dict[str, Type[Integrator]] = {
+    'euler': ExplicitEuler,
+    'backward-euler': BackwardEuler,
+    'crank-nicolson': CrankNicolson,
+    'adaptive': AdaptiveIntegrator,
+}
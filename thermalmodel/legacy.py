@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from typing import Dict, List
+import os
+import numpy as np
+import pandas as pd
+
+from .links import ConductionLink, ContactLink, RadiationLink
+from .environment import OrbitEnvironment
+from .thermalmodel import ThermalModel
+from .timeseries import TimeSeries
+
+# CSV files of the original script, and the name of the arrays they are read into
+# IFN x IFN matrices
+LEGACY_MATRICES: Dict[str, str] = {
+    'viewingFactor': 'F_i_j.csv',
+    'conductivity': 'k_i_j.csv',
+    'conductionArea': 'A_cond.csv',
+    'conductionLength': 'L_cond.csv',
+    'contactResistance': 'Cont_Res.csv',
+}
+# one value per IFN
+LEGACY_IFN_VALUES: Dict[str, str] = {
+    'area': 'A_rad.csv',
+    'emissivity': 'e.csv',
+    'absorptivity': 'absorption.csv',
+    'sunAccess': 'F_sun.csv',
+    'earthAccess': 'F_Earth.csv',
+    'spaceAccess': 'F_space.csv',
+    'initialTemperature': 'Ti.csv',
+}
+# one value per HSN
+LEGACY_HSN_VALUES: Dict[str, str] = {
+    'mass': 'mass.csv',
+    'heatCapacity': 'Cp.csv',
+}
+
+
+def readLegacyInput(directory: str) -> Dict[str, np.ndarray]:
+    """
+    Read the CSV files of the original script (`old-script/input`) into NumPy arrays, named as in `LEGACY_MATRICES`, `LEGACY_IFN_VALUES` and `LEGACY_HSN_VALUES`.
+
+    The IFN x IFN matrices keep their orientation: entry [j, i] describes the link from IFN i to IFN j. The per IFN and per HSN values are read from the first row of their files, and 'combiningNodes' holds the HSN index of every IFN (`Combining_nodes.csv`).
+    """
+    arrays = {}
+    for name, filename in LEGACY_MATRICES.items():
+        arrays[name] = pd.read_csv(os.path.join(directory, filename)).to_numpy(dtype=np.float64)
+    countIFN = arrays['viewingFactor'].shape[1]
+    for name, filename in LEGACY_IFN_VALUES.items():
+        # some files carry thousands of empty columns after those of the IFN
+        arrays[name] = pd.read_csv(os.path.join(directory, filename), header=None, skiprows=1, nrows=1, usecols=range(countIFN)).to_numpy(dtype=np.float64)[0]
+    for name, filename in LEGACY_HSN_VALUES.items():
+        arrays[name] = pd.read_csv(os.path.join(directory, filename), nrows=1).to_numpy(dtype=np.float64)[0]
+    arrays['combiningNodes'] = pd.read_csv(os.path.join(directory, 'Combining_nodes.csv')).to_numpy(dtype=np.intp)[:, 1]
+    return arrays
+
+
+def legacyModelDescription(arrays: Dict[str, np.ndarray]) -> List:
+    """
+    Convert the arrays of `readLegacyInput()` into a `model_description` for `ThermalModel`.
+
+    HSN and IFN are named after their index, such that the readings have the columns of `T_store.csv`. Every non-zero matrix entry [j, i] becomes a link from IFN i to IFN j, combining the link types it has parameters for:
+
+        - ConductionLink for a non-zero conductivity
+        - ContactLink for a non-zero contact resistance (K/W, hence a unit contact area)
+        - RadiationLink for a non-zero viewing factor, with the areas of both IFN
+
+    Every HSN starts at the initial temperature of its last IFN, as in the original script.
+    """
+    hsnOfIFN = arrays['combiningNodes']
+    countHSN = arrays['mass'].shape[0]
+    conductivity = arrays['conductivity']
+    resistance = arrays['contactResistance']
+    viewingFactor = arrays['viewingFactor']
+
+    linksIFN: Dict[int, List] = { i: [] for i in range(hsnOfIFN.shape[0]) }
+    targets, sources = np.nonzero((conductivity != 0) | (resistance != 0) | (viewingFactor != 0))
+    for j, i in zip(targets, sources):
+        if i == j:
+            continue
+        linkTypes = []
+        parameters = {}
+        if conductivity[j, i] != 0:
+            linkTypes.append(ConductionLink)
+            parameters.update({
+                'conductivity': conductivity[j, i],
+                'conductionArea': arrays['conductionArea'][j, i],
+                'length': arrays['conductionLength'][j, i],
+            })
+        if resistance[j, i] != 0:
+            linkTypes.append(ContactLink)
+            parameters.update({ 'contactArea': 1, 'resistance': resistance[j, i] })
+        if viewingFactor[j, i] != 0:
+            linkTypes.append(RadiationLink)
+            parameters.update({
+                'radiationArea1': arrays['area'][i],
+                'radiationArea2': arrays['area'][j],
+                'viewingFactor': viewingFactor[j, i],
+            })
+        linksIFN[i].append((f'{i}-{j}', (str(hsnOfIFN[j]), str(j)), linkTypes, parameters))
+
+    temperature = np.zeros(countHSN)
+    temperature[hsnOfIFN] = arrays['initialTemperature']
+    model_description = []
+    for h in range(countHSN):
+        nodesIFN = []
+        for i in np.flatnonzero(hsnOfIFN == h):
+            nodesIFN.append((
+                str(i),
+                {
+                    'emissivity': arrays['emissivity'][i],
+                    'absorptivity': arrays['absorptivity'][i],
+                    'area': arrays['area'][i],
+                    'sunAccess': arrays['sunAccess'][i],
+                    'earthAccess': arrays['earthAccess'][i],
+                    'spaceAccess': arrays['spaceAccess'][i],
+                },
+                linksIFN[i],
+            ))
+        model_description.append((
+            str(h),
+            {
+                'mass': arrays['mass'][h],
+                'heatCapacity': arrays['heatCapacity'][h],
+                'heatGeneration': 0,
+                'temperature': temperature[h],
+            },
+            nodesIFN,
+        ))
+    return model_description
+
+
+def loadLegacyModel(directory: str, simulation_duration: float, timestep: float = 1,
+                    cacheDirectory: str = None, **kwargs) -> ThermalModel:
+    """
+    Build a `ThermalModel` from the input directory of the original script, e.g. `old-script/input`.
+
+    Besides the matrices of `readLegacyInput()`, the sun elevation (`ele.csv`) and the heat generation of every HSN (`heat_generated.csv`) are read through the binary cache of `timeseries.TimeSeries.fromFile()`, one sample per second. The caches are written next to the CSV files, or into `cacheDirectory` if given. The environment uses the constants of the original script. Further arguments such as `backend` or `integrator` are passed on to `ThermalModel`.
+
+    The readings of `simulate()` correspond to `T_store.csv`, shifted by one timestep: the original script reports the temperatures at the end of every step at the time the step started. `legacyInterfaceHeat()` provides `Q_net.csv`.
+
+    The original script adds the radiation along the rows of `F_i_j` with the wrong sign, such that both ends of a radiation link gain heat. Here the links exchange it, hence the results differ once radiating IFN have different temperatures.
+    """
+    arrays = readLegacyInput(directory)
+    model_description = legacyModelDescription(arrays)
+    hsnNames = [ nameHSN for nameHSN, _, _ in model_description ]
+    environment = OrbitEnvironment.fromCSV(os.path.join(directory, 'ele.csv'), cacheDirectory=cacheDirectory)
+    heatGeneration = TimeSeries.fromFile(os.path.join(directory, 'heat_generated.csv'), columns=hsnNames,
+                                         cacheDirectory=cacheDirectory)
+    return ThermalModel(simulation_duration, timestep, model_description,
+                        environment=environment, heat_generation=heatGeneration, **kwargs)
+
+
+def legacyInterfaceHeat(model: ThermalModel) -> pd.DataFrame:
+    """Net heat (W) of every IFN during every recorded step of the last simulation (`Q_net.csv`), from its links and the environment. Requires the readings of every step, i.e. the default recording policy."""
+    engine = model.engine
+    readings = model.temperatureReadings
+    hsnNames = [ hsnName for hsnName, _ in model.IDmap['HSN'] ]
+    ifnNames = [ ifnName for ifnName, _ in model.IDmap['IFN'] ]
+    # the IFN are grouped by HSN in the model, and sorted by their index in the legacy results
+    temperatures = readings[hsnNames].to_numpy()
+    initial = np.array([ model.heatStorageNodes[name].parameters.get('temperature', 0) for name in hsnNames ])
+    previous = np.vstack([ initial, temperatures[:-1] ])
+    heat = np.vstack([ engine.interfaceHeatExchange(T, stepIndex) for stepIndex, T in enumerate(previous) ])
+    return pd.DataFrame(heat, index=readings.index, columns=ifnNames)[sorted(ifnNames, key=int)]
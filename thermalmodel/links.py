@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, Callable, List, Type
+from typing import TYPE_CHECKING, Callable, List, Tuple, Type
 
 if TYPE_CHECKING:
     from .nodes import InterfaceNode
@@ -9,6 +9,13 @@ if TYPE_CHECKING:
 
 class LinkType():
 
+    # no per-instance __dict__, large models hold many thousands of links
+    # subclasses defined elsewhere without __slots__ get one as usual
+    __slots__ = ('options', 'node1', 'node2')
+
+    # link parameters read from `options`, see ThermalModel.setParameter()
+    PARAMETERS: Tuple[str, ...] = ()
+
     def __init__(self, options: dict):
         self.options: dict = options
         self.node1: InterfaceNode = options['node1']
@@ -20,12 +27,23 @@ class LinkType():
     def computeHeatExchange(self) -> float:
         raise NotImplementedError()
 
+    def invalidate(self):
+        """Recompute cached coefficients after `options` or the parameters of the linked nodes changed."""
+        pass
+
 
 class ManualLink(LinkType):
 
+    __slots__ = ('func',)
+
+    PARAMETERS: Tuple[str, ...] = ('func', 'viewingFactor')
+
     def __init__(self, options: dict):
         super().__init__(options)
-        self.func: Callable = options['func']
+        self.invalidate()
+
+    def invalidate(self):
+        self.func: Callable = self.options['func']
 
     def computeViewingFator(self) -> float:
         return self.options['viewingFactor']
@@ -34,61 +52,113 @@ class ManualLink(LinkType):
         return self.func()
 
 
-class RadiationLink(LinkType):
+class InverseLink(LinkType):
+
+    __slots__ = ('link',)
 
     def __init__(self, options: dict):
+        """Mirror of another link, going from its `node2` back to its `node1`. Generated by `ThermalModel` for every link defined in the model description."""
         super().__init__(options)
-        self._radiationArea1: float = options['radiationArea1']
-        self._radiationArea2: float = options['radiationArea2']
-        self._viewingFactor: float = options['viewingFactor']
+        self.link: Link = options['link']
 
     def computeHeatExchange(self) -> float:
+        return -self.link.computeHeatExchange()
+
+
+class RadiationLink(LinkType):
+
+    __slots__ = ('_radiationArea1', '_radiationArea2', '_viewingFactor', '_radiationFactor')
+
+    PARAMETERS: Tuple[str, ...] = ('radiationArea1', 'radiationArea2', 'viewingFactor')
+
+    def __init__(self, options: dict):
+        super().__init__(options)
+        self.invalidate()
+
+    def invalidate(self):
+        self._radiationArea1: float = self.options['radiationArea1']
+        self._radiationArea2: float = self.options['radiationArea2']
+        self._viewingFactor: float = self.options['viewingFactor']
+        self._radiationFactor: float = self.computeRadiationFactor()
+
+    def computeRadiationFactor(self) -> float:
+        """Factor (W/K^4) by which the difference of the 4th powers of the temperatures is multiplied."""
         boltzman: float = 5.670374419e-8
         A1 = self._radiationArea1
         A2 = self._radiationArea2
         e1 = self.node1._emissivity
         e2 = self.node2._emissivity
         F = self._viewingFactor
-        resistance = boltzman / (
+        # surface and space resistances (1/m^2) of the gray body exchange
+        resistance = (
             ( (1 - e1) / (e1 * A1) )
             + (1 / (A1 * F))
             + ( (1 - e2) / (e2 * A2) )
         )
+        return boltzman / resistance
+
+    def computeHeatExchange(self) -> float:
         deltaT = self.node1.getTemperature()**4 - self.node2.getTemperature()**4
-        heatTransferRate = - deltaT / resistance
+        heatTransferRate = - deltaT * self._radiationFactor
         return heatTransferRate
 
 
 class ContactLink(LinkType):
 
+    __slots__ = ('_contactArea', '_resistance', '_conductance')
+
+    PARAMETERS: Tuple[str, ...] = ('contactArea', 'resistance')
+
     def __init__(self, options: dict):
         super().__init__(options)
-        self._contactArea: float = options['contactArea']
-        self._resistance: float = options['resistance']
+        self.invalidate()
+
+    def invalidate(self):
+        self._contactArea: float = self.options['contactArea']
+        self._resistance: float = self.options['resistance']
+        self._conductance: float = self.computeConductance()
+
+    def computeConductance(self) -> float:
+        """Thermal conductance (W/K) of the contact."""
+        return self._contactArea / self._resistance
 
     def computeHeatExchange(self) -> float:
         deltaT = self.node1.getTemperature() - self.node2.getTemperature()
-        heatTransferRate = - (deltaT * self._contactArea) / self._resistance
+        heatTransferRate = - deltaT * self._conductance
         return heatTransferRate
 
 
 class ConductionLink(LinkType):
 
+    __slots__ = ('_conductionArea', '_conductivity', '_length', '_conductance')
+
+    PARAMETERS: Tuple[str, ...] = ('conductionArea', 'conductivity', 'length')
+
     def __init__(self, options: dict):
         super().__init__(options)
-        self._conductionArea: float = options['conductionArea']
-        self._conductivity: float = options['conductivity']
-        self._length: float = options['length']
+        self.invalidate()
 
-    def computeHeatExchange(self) -> float:
+    def invalidate(self):
+        self._conductionArea: float = self.options['conductionArea']
+        self._conductivity: float = self.options['conductivity']
+        self._length: float = self.options['length']
+        self._conductance: float = self.computeConductance()
+
+    def computeConductance(self) -> float:
+        """Thermal conductance (W/K) of the conduction path."""
         resistance = self._length / (self._conductivity * self._conductionArea)
+        return 1 / resistance
+
+    def computeHeatExchange(self) -> float:
         deltaT = self.node1.getTemperature() - self.node2.getTemperature()
-        heatTransferRate = - deltaT / resistance
+        heatTransferRate = - deltaT * self._conductance
         return heatTransferRate
 
 
 class AmbientLink(LinkType):
 
+    __slots__ = ()
+
     def __init__(self, options: dict):
         super().__init__(options)
 
@@ -99,6 +169,8 @@ class AmbientLink(LinkType):
 
 class VacuumChamberLink(LinkType):
 
+    __slots__ = ()
+
     def __init__(self, options: dict):
         super().__init__(options)
 
@@ -109,6 +181,8 @@ class VacuumChamberLink(LinkType):
 
 class Link():
 
+    __slots__ = ('node1', 'node2', 'linkTypes', 'parameters')
+
     def __init__(self, node1: InterfaceNode, node2: InterfaceNode,
                  linkTypes: List[Type[LinkType]],
                  parameters: dict):
@@ -122,3 +196,8 @@ class Link():
 
     def computeHeatExchange(self) -> float:
         return sum(( lt.computeHeatExchange() for lt in self.linkTypes ))
+
+    def invalidate(self):
+        """Recompute the cached coefficients of all link types, e.g. after changing `parameters`."""
+        for lt in self.linkTypes:
+            lt.invalidate()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from typing import Dict, List
+import os
+import numpy as np
+
+# incremented whenever the content of model files changes
+MODEL_FILE_VERSION: int = 3
+
+
+def saveModelFile(filename: str, arrays: Dict[str, np.ndarray], names: Dict[str, List[str]],
+                  duration: float, timestep: float, linkTypeCounts: Dict[str, int]):
+    """
+    Write a compiled model into an uncompressed `.npz` file, see `ThermalModel.export()`.
+
+    Holds the arrays of the compiled model (see `CompiledModel.arrays()`) prefixed by 'array/', the names of the HSN, IFN and links in the order of their IDs prefixed by 'names/' (IFN and links by their path, see `naming.NameIndex`), and the duration and timestep the time-varying inputs were evaluated for. The previous file is only replaced once the new one is complete.
+    """
+    content = {
+        'version': np.array(MODEL_FILE_VERSION),
+        'duration': np.array(duration),
+        'timestep': np.array(timestep),
+        'linkTypes': np.array(list(linkTypeCounts), dtype=str),
+        'linkTypeCounts': np.array(list(linkTypeCounts.values()), dtype=np.int64),
+    }
+    content.update({ f'array/{name}': np.asarray(values) for name, values in arrays.items() })
+    content.update({ f'names/{kind}': np.array(values, dtype=str) for kind, values in names.items() })
+    temporary = filename + '.tmp'
+    with open(temporary, 'wb') as file:
+        np.savez(file, **content)
+    os.replace(temporary, filename)
+
+
+def loadModelFile(filename: str) -> Dict:
+    """Read a model file written by `saveModelFile()`, returning its arrays, names, duration, timestep and link type counts."""
+    with np.load(filename) as data:
+        content = { name: data[name] for name in data.files }
+    version = int(content['version'])
+    if version != MODEL_FILE_VERSION:
+        raise ValueError(f"Model file '{filename}' has version {version}, expected {MODEL_FILE_VERSION}")
+    return {
+        'arrays': { name[len('array/'):]: values for name, values in content.items() if name.startswith('array/') },
+        'names': { name[len('names/'):]: values.tolist() for name, values in content.items() if name.startswith('names/') },
+        'duration': content['duration'].item(),
+        'timestep': content['timestep'].item(),
+        'linkTypeCounts': dict(zip(content['linkTypes'].tolist(), content['linkTypeCounts'].tolist())),
+    }
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Set, Sequence, Tuple, Type, Union
+import os
+import numpy as np
+import pandas as pd
+
+from .environment import OrbitEnvironment
+from .nodes import LinkType
+from .sweep import ParametricSweep
+from .timeseries import TimeSeries
+
+# either a function drawing a value from a numpy Generator, or the name of a
+# Generator method followed by its arguments, e.g. ('normal', 0.05, 0.005)
+Distribution = Union[Callable[[np.random.Generator], float], Tuple]
+
+
+class MonteCarlo():
+
+    def __init__(self, simulation_duration: float, timestep: float,
+                 model_description: List[
+                     Tuple[str, Dict, List[
+                         Tuple[str, Dict, List[
+                             Tuple[str, Tuple[str, str], List[Type[LinkType]], Dict]
+                         ]]
+                     ]]
+                 ],
+                 distributions: Dict[str, Distribution],
+                 runs: int,
+                 seed: int = 0,
+                 workers: int = None,
+                 chunksize: int = 10,
+                 percentiles: Sequence[float] = (5, 50, 95),
+                 environment: OrbitEnvironment = None,
+                 heat_generation: TimeSeries = None):
+        """
+        Monte Carlo uncertainty analysis of a model, running the simulations on several processes.
+
+        Every run draws its parameters from the given distributions and is simulated like a `ParametricSweep` variant. Runs are handed out to the worker processes in chunks; every chunk is integrated at once and only sends a temperature summary per run and HSN back, never the full temperature history.
+
+        Parameters:
+
+            - simulation_duration, timestep, model_description
+
+                See `ThermalModel`. The description is sent to every worker process, hence it must be picklable. Like for `ParametricSweep`, links with a `ManualLink` type are not supported.
+
+            - distributions: Dict[str, Distribution]
+
+                Maps parameter paths (see `thermalmodel.setDescriptionParameter()`) to the distribution they are drawn from. A distribution is either the name of a `numpy.random.Generator` method followed by its arguments, or a (picklable) function taking the Generator and returning a value:
+
+                    {
+                        'Battery/mass': ('normal', 10, 0.5),
+                        'Battery/BAT-top/BAT-BC/resistance': ('uniform', 0.04, 0.06),
+                    }
+
+            - runs: int
+
+                The number of simulations.
+
+            - seed: int
+
+                Every run draws from its own generator, seeded from `seed` and the run number. Results are thus reproducible regardless of the number of workers and the chunk size.
+
+            - workers: int
+
+                Number of worker processes, defaults to the number of CPUs.
+
+            - chunksize: int
+
+                Number of runs per task sent to a worker. Larger chunks reduce overhead, but each worker holds the temperature history of a whole chunk in memory.
+
+            - percentiles: Sequence[float]
+
+                Percentiles of the temperature of each HSN over time, reported alongside its minimum and maximum.
+
+            - environment: OrbitEnvironment
+
+                See `ThermalModel`, shared by all runs.
+
+            - heat_generation: TimeSeries
+
+                See `ThermalModel`, shared by all runs. The HSN it covers ignore sampled values of their 'heatGeneration'.
+
+        Methods:
+
+            - run()
+            - simulate()
+        """
+        self.duration: float = simulation_duration  # seconds
+        self.timestep: float = timestep  # seconds
+        self.model_description = model_description
+        self.distributions: Dict[str, Distribution] = distributions
+        self.runs: int = runs
+        self.seed: int = seed
+        self.workers: int = workers or os.cpu_count() or 1
+        self.chunksize: int = chunksize
+        self.percentiles: Tuple[float, ...] = tuple(percentiles)
+        self.environment: OrbitEnvironment = environment
+        self.heatGenerationSeries: TimeSeries = heat_generation
+
+        self.samples: pd.DataFrame = pd.DataFrame(columns=list(distributions))
+        self.summary: pd.DataFrame = pd.DataFrame()
+
+    def run(self) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Run all simulations, yielding the results of every chunk as soon as it completes.
+
+        Every item is a pair of DataFrames: the sampled parameters (indexed by run number), and the summary with the columns 'run', 'HSN', 'min', 'max' and one 'p<percentile>' column per percentile. Chunks may complete in any order.
+        """
+        starts = iter(range(0, self.runs, self.chunksize))
+        pending: Set[Future] = set()
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_initWorker,
+            initargs=(self.duration, self.timestep, self.model_description, self.distributions, self.seed, self.percentiles, self.environment, self.heatGenerationSeries),
+        ) as executor:
+
+            def submit() -> bool:
+                start = next(starts, None)
+                if start is None:
+                    return False
+                pending.add(executor.submit(_runChunk, start, min(start + self.chunksize, self.runs)))
+                return True
+
+            # keep a bounded number of chunks in flight
+            for _ in range(2 * self.workers):
+                if not submit():
+                    break
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    submit()
+                    yield future.result()
+
+    def simulate(self) -> pd.DataFrame:
+        """Run all simulations and collect the summaries (see `run()`) into `self.summary`, sorted by run. The sampled parameters are collected into `self.samples`."""
+        samples: List[pd.DataFrame] = []
+        summaries: List[pd.DataFrame] = []
+        for chunkSamples, chunkSummary in self.run():
+            samples.append(chunkSamples)
+            summaries.append(chunkSummary)
+        self.samples = pd.concat(samples).sort_index()
+        self.summary = pd.concat(summaries).sort_values('run', kind='stable').reset_index(drop=True)
+        return self.summary
+
+
+# state of a worker process, set once by _initWorker()
+_worker: Dict = {}
+
+
+def _initWorker(duration: float, timestep: float, model_description: List,
+                distributions: Dict[str, Distribution], seed: int, percentiles: Tuple[float, ...],
+                environment: OrbitEnvironment, heatGenerationSeries: TimeSeries):
+    _worker.update(
+        duration=duration,
+        timestep=timestep,
+        model_description=model_description,
+        distributions=distributions,
+        seed=seed,
+        percentiles=percentiles,
+        environment=environment,
+        heatGenerationSeries=heatGenerationSeries,
+    )
+
+
+def _sample(distribution: Distribution, rng: np.random.Generator) -> float:
+    if callable(distribution):
+        return distribution(rng)
+    method, *arguments = distribution
+    return getattr(rng, method)(*arguments)
+
+
+def _runChunk(start: int, stop: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    distributions = _worker['distributions']
+    percentiles = _worker['percentiles']
+    runs = np.arange(start, stop)
+
+    rows = []
+    for run in runs:
+        rng = np.random.default_rng(np.random.SeedSequence(_worker['seed'], spawn_key=(int(run),)))
+        rows.append({ path: _sample(distribution, rng) for path, distribution in distributions.items() })
+    samples = pd.DataFrame(rows, index=pd.Index(runs, name='run'), columns=list(distributions))
+
+    sweep = ParametricSweep(_worker['duration'], _worker['timestep'], _worker['model_description'], samples,
+                            _worker['environment'], _worker['heatGenerationSeries'])
+    readings = sweep.run()
+
+    countHSN = len(sweep.hsnNames)
+    summary = pd.DataFrame({
+        'run': np.repeat(runs, countHSN),
+        'HSN': np.tile(sweep.hsnNames, len(runs)),
+        'min': readings.min(axis=0).ravel(),
+        'max': readings.max(axis=0).ravel(),
+    })
+    for percentile, values in zip(percentiles, np.percentile(readings, percentiles, axis=0)):
+        summary[f'p{percentile:g}'] = values.ravel()
+    return samples, summary
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from typing import Dict, Iterable, List
+import numpy as np
+
+
+class NameIndex():
+
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        Bidirectional mapping between the names of the HSN, IFN or links of a model and their integer IDs, i.e. their position in the compiled arrays.
+
+        Names are mapped through a dict and IDs through a list, such that both directions take constant time. The objects behind the names can be registered along with them, and be looked up by identity.
+
+        IFN and links are named by their path, as used by `ThermalModel.setParameter()`: 'HSN/IFN' and 'HSN/IFN/link'.
+
+        Methods:
+
+            - add(name, obj)
+            - ID(name)
+            - IDs(names)
+            - name(ID)
+            - objectID(obj)
+        """
+        self.names: List[str] = []
+        self._IDs: Dict[str, int] = {}
+        self._objectIDs: Dict[int, int] = {}
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._IDs
+
+    def add(self, name: str, obj: object = None) -> int:
+        """Assign the next ID to a name, and to the object it names if given."""
+        if name in self._IDs:
+            raise KeyError(f"Name '{name}' is already taken")
+        ID = len(self.names)
+        self.names.append(name)
+        self._IDs[name] = ID
+        if obj is not None:
+            self._objectIDs[id(obj)] = ID
+        return ID
+
+    def ID(self, name: str) -> int:
+        try:
+            return self._IDs[name]
+        except KeyError:
+            raise KeyError(f"Unknown name '{name}'") from None
+
+    def IDs(self, names: Iterable[str]) -> np.ndarray:
+        """IDs of several names, as an index array."""
+        return np.array([ self.ID(name) for name in names ], dtype=np.intp)
+
+    def name(self, ID: int) -> str:
+        return self.names[ID]
+
+    def objectID(self, obj: object) -> int:
+        """ID of an object registered by `add()`."""
+        return self._objectIDs[id(obj)]
@@ -10,6 +10,9 @@ from .links import Link, LinkType
 
 class Node():
 
+    # no per-instance __dict__, large models hold many thousands of nodes
+    __slots__ = ('_temperature', 'parameters')
+
     def __init__(self, parameters: Dict):
         self._temperature: float = 0
         self.parameters: Dict = {}
@@ -23,6 +26,8 @@ class Node():
 
 class HeatStorageNode(Node):
 
+    __slots__ = ('_timestep', 'mass', 'heatCapacity', 'heatGeneration', '_heatExchange', 'interfaces')
+
     def __init__(self, parameters: dict):
         super().__init__(parameters)
         self.parameters: Dict = parameters
@@ -68,19 +73,33 @@ class HeatStorageNode(Node):
 
 class InterfaceNode(Node):
 
+    __slots__ = (
+        'referenceNode', '_heatExchange', '_emissivity', '_absorptivity',
+        '_area', '_sunAccess', '_earthAccess', '_spaceAccess', 'interfaceLinks',
+    )
+
     def __init__(self, referenceNode: HeatStorageNode, parameters: dict):
         super().__init__(parameters)
 
         self.referenceNode: HeatStorageNode = referenceNode
 
-        self._temperature: float  = referenceNode._temperature
         self._heatExchange: float = -1
 
         self._emissivity: float    = parameters.get('emissivity', -1)
         self._absorptivity: float  = parameters.get('absorptivity', -1)
 
+        # exposure to the orbit environment, see environment.OrbitEnvironment
+        self._area: float        = parameters.get('area', 0)
+        self._sunAccess: float   = parameters.get('sunAccess', 0)
+        self._earthAccess: float = parameters.get('earthAccess', 0)
+        self._spaceAccess: float = parameters.get('spaceAccess', 0)
+
         self.interfaceLinks: Dict[str, Link] = {}
 
+    def getTemperature(self) -> float:
+        # no thermal mass of its own, the IFN is at the current temperature of its HSN
+        return self.referenceNode._temperature
+
     def computeHeatExchange(self) -> float:
         self._heatExchange = sum((
             link.computeHeatExchange() for link in self.interfaceLinks.values()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from .thermalmodel import ThermalModel
+
+# timed methods of the compiled model, and the link types they evaluate
+LINK_STAGES: Dict[str, Tuple[str, List[str]]] = {
+    '_addLinearLinks': ('linear links', ['ContactLink', 'ConductionLink']),
+    '_addRadiationLinks': ('radiation links', ['RadiationLink']),
+    '_addManualLinks': ('manual links', ['ManualLink']),
+    '_addEnvironment': ('environment', []),
+}
+
+
+class Profiler():
+
+    def __init__(self):
+        """
+        Measures where `ThermalModel.simulate()` spends its time, see its `profiler` argument.
+
+        While attached to a model, the methods of interest are replaced by timed wrappers on the respective instances; the classes themselves are left untouched. Simulations without a profiler thus run exactly the same code as before.
+
+        The time of every step is split into the stages:
+
+            - linear links, radiation links, manual links, environment
+
+                Evaluation of the respective links by the compiled model. Custom link types are evaluated with the manual links.
+
+            - jacobian
+
+                Linearization of the model by the implicit and adaptive integrators.
+
+            - HSN update
+
+                Everything else done by the integrator: heat generation, summing up the heat of the IFN into their HSN and computing the new temperatures.
+
+            - recording
+
+                Handing the temperatures to the recording policy.
+
+            - other
+
+                The remainder of the loop, such as stop conditions and checkpoints.
+
+        Methods:
+
+            - attach(model, record)
+            - detach()
+            - summary()
+            - linkTypes()
+            - histogram(bins)
+            - report()
+        """
+        self.totals: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.stepTimes: List[float] = []
+        self.linkTypeCounts: Dict[str, int] = {}
+        self._patched: List[Tuple[object, str]] = []
+        self._lastStep: float = None
+
+    def _timed(self, stage: str, func: Callable) -> Callable:
+        totals, calls = self.totals, self.calls
+        totals.setdefault(stage, 0.0)
+        calls.setdefault(stage, 0)
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            result = func(*args, **kwargs)
+            totals[stage] += perf_counter() - start
+            calls[stage] += 1
+            return result
+        return timed
+
+    def _patch(self, instance: object, name: str, stage: str):
+        setattr(instance, name, self._timed(stage, getattr(instance, name)))
+        self._patched.append((instance, name))
+
+    def attach(self, model: ThermalModel, record: Callable) -> Callable:
+        """Start measuring the steps of the model. Returns a timed version of the `record` method of the recording policy, to be called after every step instead."""
+        engine = model.engine
+        for name, (stage, _) in LINK_STAGES.items():
+            self._patch(engine, name, stage)
+        self._patch(engine, 'jacobian', 'jacobian')
+        self._patch(model.integrator, 'step', 'step')
+        self.linkTypeCounts.update(engine.linkTypeCounts)
+
+        # the time between two readings is the time of a step
+        timedRecord = self._timed('recording', record)
+        stepTimes = self.stepTimes
+        self._lastStep = perf_counter()
+
+        def recordStep(*args, **kwargs):
+            timedRecord(*args, **kwargs)
+            now = perf_counter()
+            stepTimes.append(now - self._lastStep)
+            self._lastStep = now
+        return recordStep
+
+    def detach(self):
+        """Restore the methods replaced by `attach()`."""
+        for instance, name in self._patched:
+            instance.__dict__.pop(name, None)
+        self._patched = []
+
+    def summary(self) -> pd.DataFrame:
+        """Time spent per stage: number of calls, total seconds, microseconds per call and share of the total."""
+        totals = self.totals
+        links = sum(totals.get(stage, 0.0) for stage, _ in LINK_STAGES.values())
+        stages = { stage: totals.get(stage, 0.0) for stage, _ in LINK_STAGES.values() }
+        stages['jacobian'] = totals.get('jacobian', 0.0)
+        stages['HSN update'] = totals.get('step', 0.0) - links - stages['jacobian']
+        stages['recording'] = totals.get('recording', 0.0)
+        stages['other'] = sum(self.stepTimes) - totals.get('step', 0.0) - stages['recording']
+        calls = { stage: self.calls.get(stage, 0) for stage, _ in LINK_STAGES.values() }
+        calls['jacobian'] = self.calls.get('jacobian', 0)
+        calls['HSN update'] = self.calls.get('step', 0)
+        calls['recording'] = self.calls.get('recording', 0)
+        calls['other'] = len(self.stepTimes)
+        df = pd.DataFrame({
+            'calls': pd.Series(calls),
+            'total (s)': pd.Series(stages),
+        })
+        df['per call (us)'] = 1e6 * df['total (s)'] / df['calls'].where(df['calls'] > 0)
+        total = df['total (s)'].sum()
+        df['share (%)'] = 100 * df['total (s)'] / total if total > 0 else 0.0
+        df.index.name = 'stage'
+        return df
+
+    def linkTypes(self) -> pd.DataFrame:
+        """Number of compiled instances of every LinkType subclass, how often they were evaluated, and the time of the stage evaluating them."""
+        rows = []
+        compiled = { linkType for _, linkTypes in LINK_STAGES.values() for linkType in linkTypes }
+        for name, (stage, linkTypes) in LINK_STAGES.items():
+            if name == '_addManualLinks':
+                # custom link types are evaluated along with the ManualLink functions
+                linkTypes = linkTypes + sorted(set(self.linkTypeCounts) - compiled)
+            for linkType in linkTypes:
+                count = self.linkTypeCounts.get(linkType, 0)
+                rows.append({
+                    'link type': linkType,
+                    'instances': count,
+                    'evaluations': count * self.calls.get(stage, 0),
+                    'stage': stage,
+                    'stage time (s)': self.totals.get(stage, 0.0),
+                })
+        return pd.DataFrame(rows).set_index('link type')
+
+    def histogram(self, bins: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """Histogram of the step times, with logarithmically spaced bin edges (s)."""
+        times = np.array(self.stepTimes)
+        times = times[times > 0]
+        if times.size == 0:
+            return np.zeros(0, dtype=np.intp), np.zeros(0)
+        edges = np.geomspace(times.min(), times.max() * (1 + 1e-9), bins + 1)
+        counts, edges = np.histogram(times, bins=edges)
+        return counts, edges
+
+    def report(self) -> str:
+        """Summary, link types and step time histogram as text."""
+        counts, edges = self.histogram()
+        histogram = pd.DataFrame({
+            'from (us)': 1e6 * edges[:-1],
+            'to (us)': 1e6 * edges[1:],
+            'steps': counts,
+        })
+        times = np.array(self.stepTimes)
+        lines = [
+            f'Steps: {times.size}, total {times.sum():.3f} s, '
+            f'median {1e6 * np.median(times) if times.size else 0:.1f} us per step',
+            '',
+            self.summary().to_string(float_format=lambda x: f'{x:.3f}'),
+            '',
+            self.linkTypes().to_string(float_format=lambda x: f'{x:.3f}'),
+            '',
+            histogram.to_string(index=False, float_format=lambda x: f'{x:.1f}'),
+        ]
+        return '\n'.join(lines)
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from typing import Dict, Iterator, List, Type
+import os
+import numpy as np
+import pandas as pd
+
+from .checkpoint import appendReadings, loadReadings
+
+
+def timeChunks(duration: float, timestep: float, size: int, start: float = None) -> Iterator[np.ndarray]:
+    """Times at which the temperatures are recorded (see `timeGrid()`), in chunks of at most `size` steps. Given the time of a reading, `start` continues the times after it."""
+    t = 0 * timestep if start is None else start
+    while t < duration:
+        # accumulate like 't += timestep' would, keeping integer times as integers
+        times = np.cumsum(np.concatenate(([t], np.full(size, timestep))))
+        chunk = times[1:][times[:-1] < duration]
+        yield chunk
+        t = chunk[-1]
+
+
+def timeGrid(duration: float, timestep: float) -> np.ndarray:
+    """Times at which the temperatures are recorded: every `timestep` seconds, until `duration` is reached."""
+    chunks = list(timeChunks(duration, timestep, int(np.ceil(duration / timestep)) + 1))
+    return np.concatenate(chunks) if chunks else np.empty(0)
+
+
+class ResultBuffer():
+
+    def __init__(self, names: List[str], timeType: np.dtype = np.float64):
+        """
+        Preallocated storage for the HSN temperatures of a simulation.
+
+        Temperatures are written into a single `float64` array of shape (steps, HSN). The simulation reserves room for all its steps up front; the buffer only grows beyond that when recording more than reserved.
+
+        Parameters:
+
+            - names: List[str]
+
+                The names of the recorded columns, usually the HSN in the order of the compiled model.
+
+            - timeType: numpy.dtype
+
+                Type of the recorded times, such that integer timesteps lead to integer times.
+
+        Attributes:
+
+            - times: numpy.ndarray
+
+                Time of every recorded step.
+
+            - temperatures: numpy.ndarray
+
+                Recorded temperatures, one row per entry of `times`. This is a view on the buffer, not a copy.
+        """
+        self.names: List[str] = names
+        self._times: np.ndarray = np.empty(0, dtype=timeType)
+        self._temperatures: np.ndarray = np.empty((0, len(names)))
+        self._position: int = 0
+        # readings file of the checkpoints, and the number of readings written to it, see snapshot()
+        self._readingsFile: str = None
+        self._persisted: int = 0
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._times[:self._position]
+
+    @property
+    def temperatures(self) -> np.ndarray:
+        return self._temperatures[:self._position]
+
+    def _resize(self, capacity: int):
+        times = np.empty(capacity, dtype=self._times.dtype)
+        temperatures = np.empty((capacity, len(self.names)))
+        position = self._position
+        times[:position] = self._times[:position]
+        temperatures[:position] = self._temperatures[:position]
+        self._times, self._temperatures = times, temperatures
+
+    def reserve(self, count: int):
+        """Make room for recording `count` more steps."""
+        if self._position + count > self._times.shape[0]:
+            self._resize(self._position + count)
+
+    def record(self, time: float, temperature: np.ndarray):
+        """Store the temperatures of the given time."""
+        position = self._position
+        if position == self._times.shape[0]:
+            self._resize(max(1, 2 * position))
+        self._times[position] = time
+        self._temperatures[position] = temperature
+        self._position = position + 1
+
+    def close(self):
+        """Called once the simulation is over."""
+        pass
+
+    def snapshot(self, readingsFile: str) -> Dict[str, np.ndarray]:
+        """Arrays from which `restore()` continues the recording, see `checkpoint`. The readings themselves are appended to `readingsFile`, writing only those recorded since the previous snapshot into the same file."""
+        start = self._persisted if readingsFile == self._readingsFile else 0
+        appendReadings(readingsFile, start, self.times, self.temperatures)
+        self._readingsFile, self._persisted = readingsFile, self._position
+        return { 'readings': np.array(self._position) }
+
+    def restore(self, snapshot: Dict[str, np.ndarray], readingsFile: str):
+        count = int(snapshot['readings'])
+        times, temperatures = loadReadings(readingsFile, count, self._times.dtype, len(self.names))
+        self._position = 0
+        self.reserve(count)
+        self._times[:count] = times
+        self._temperatures[:count] = temperatures
+        self._position = count
+        self._readingsFile, self._persisted = readingsFile, count
+
+    def dataFrame(self) -> pd.DataFrame:
+        """The recorded temperatures as a DataFrame with a 'time' column and one column per entry of `names`. The temperature columns are backed by the buffer itself."""
+        df = pd.DataFrame(self.temperatures, columns=self.names, copy=False)
+        df.insert(0, 'time', self.times)
+        return df
+
+
+class CSVWriter():
+
+    def __init__(self, filename: str, names: List[str], resumeAt: int = None):
+        """Write readings to a CSV file in the format of `ThermalModel.save()`, appending every chunk to the file. Given the `position()` of an earlier writer, continue its file from there instead."""
+        if resumeAt is None:
+            self.file = open(filename, 'w', newline='')
+            pd.DataFrame(columns=['time', *names]).to_csv(self.file, index=False)
+        else:
+            self.file = open(filename, 'r+', newline='')
+            self.file.seek(resumeAt)
+            self.file.truncate()
+        self.names: List[str] = names
+
+    def write(self, times: np.ndarray, temperatures: np.ndarray):
+        df = pd.DataFrame(temperatures, columns=self.names, copy=False)
+        df.insert(0, 'time', times)
+        df.to_csv(self.file, index=False, header=False)
+        self.file.flush()
+
+    def position(self) -> int:
+        """Size of the file written so far."""
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter():
+
+    def __init__(self, filename: str, names: List[str], resumeAt: int = None):
+        """Write readings to a Parquet file, every chunk becoming a row group. Requires `pyarrow`. Parquet files cannot be resumed."""
+        if resumeAt is not None:
+            raise ValueError('Cannot resume writing a Parquet file, stream to a CSV file instead')
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError('Writing Parquet files requires pyarrow (pip install pyarrow)') from e
+        self._pyarrow = pyarrow
+        self.names: List[str] = names
+        self._writer = None
+        self._filename: str = filename
+
+    def write(self, times: np.ndarray, temperatures: np.ndarray):
+        pa = self._pyarrow
+        table = pa.table({
+            'time': times,
+            **{ name: temperatures[:, i] for i, name in enumerate(self.names) },
+        })
+        if self._writer is None:
+            self._writer = pa.parquet.ParquetWriter(self._filename, table.schema)
+        self._writer.write_table(table)
+
+    def position(self) -> int:
+        raise ValueError('Cannot resume writing a Parquet file, stream to a CSV file instead')
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+# writers by file extension
+WRITERS: Dict[str, Type] = {
+    '.csv': CSVWriter,
+    '.parquet': ParquetWriter,
+}
+
+
+class StreamingRecorder(ResultBuffer):
+
+    def __init__(self, names: List[str], filename: str, flushEvery: int, timeType: np.dtype = np.float64,
+                 resumeAt: int = None):
+        """
+        Records temperatures straight to a file instead of keeping them in memory.
+
+        Readings are buffered and written to the file every `flushEvery` steps, the buffer being reused afterwards. Memory use is thus bounded by `flushEvery`, regardless of the simulation duration.
+
+        Parameters:
+
+            - names, timeType
+
+                See `ResultBuffer`.
+
+            - filename: str
+
+                The file to write. The format is chosen by the extension, see `WRITERS`.
+
+            - flushEvery: int
+
+                Number of readings buffered before they are written.
+
+            - resumeAt: int
+
+                Continue a file written up to this position, see `snapshot()`.
+        """
+        super().__init__(names, timeType)
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in WRITERS:
+            raise ValueError(f"Cannot stream to '{filename}', supported extensions are {list(WRITERS)}")
+        self.filename: str = filename
+        self._writer = WRITERS[extension](filename, names, resumeAt)
+        self._resize(flushEvery)
+
+    def reserve(self, count: int):
+        pass
+
+    def _flush(self):
+        if self._position:
+            self._writer.write(self.times, self.temperatures)
+            self._position = 0
+
+    def record(self, time: float, temperature: np.ndarray):
+        super().record(time, temperature)
+        if self._position == self._times.shape[0]:
+            self._flush()
+
+    def snapshot(self, readingsFile: str) -> Dict[str, np.ndarray]:
+        # the readings so far are on the disk, remember where they end
+        self._flush()
+        return { 'filePosition': np.array(self._writer.position()) }
+
+    def restore(self, snapshot: Dict[str, np.ndarray], readingsFile: str):
+        # done by passing 'resumeAt' upon creation
+        pass
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+class RecordingPolicy():
+
+    def __init__(self):
+        """
+        Decides which readings of a simulation are handed to the recorder. This base policy records every step; see the subclasses for policies recording less.
+
+        Methods:
+
+            - names(hsnNames)
+            - start(recorder)
+            - reserve(count)
+            - record(time, temperature)
+            - close(complete)
+            - snapshot()
+            - restore(snapshot)
+        """
+        self.recorder: ResultBuffer = None
+
+    def names(self, hsnNames: List[str]) -> List[str]:
+        """Names of the recorded columns."""
+        return hsnNames
+
+    def start(self, recorder: ResultBuffer):
+        self.recorder = recorder
+
+    def reserve(self, count: int):
+        """The simulation is about to run `count` more steps."""
+        self.recorder.reserve(count)
+
+    def record(self, time: float, temperature: np.ndarray):
+        """Called with the HSN temperatures after every step."""
+        self.recorder.record(time, temperature)
+
+    def close(self, complete: bool = True):
+        """Called once the simulation is over. A simulation ended early by a stop condition is not `complete`, and may be continued, hence readings held back are kept for then."""
+        self.recorder.close()
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """Arrays from which `restore()` continues the recording, see `checkpoint`. Policies keeping track of earlier steps add their state."""
+        return {}
+
+    def restore(self, snapshot: Dict[str, np.ndarray]):
+        pass
+
+
+class RecordEveryNth(RecordingPolicy):
+
+    def __init__(self, n: int):
+        """Only record every n-th step."""
+        super().__init__()
+        self.n: int = n
+        self._count: int = 0
+
+    def start(self, recorder: ResultBuffer):
+        super().start(recorder)
+        self._count = 0
+
+    def reserve(self, count: int):
+        self.recorder.reserve((self._count + count) // self.n)
+
+    def record(self, time: float, temperature: np.ndarray):
+        self._count += 1
+        if self._count == self.n:
+            self.recorder.record(time, temperature)
+            self._count = 0
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        return { 'count': np.array(self._count) }
+
+    def restore(self, snapshot: Dict[str, np.ndarray]):
+        self._count = int(snapshot['count'])
+
+
+class RecordWindowStatistics(RecordingPolicy):
+
+    def __init__(self, window: int):
+        """
+        Record the minimum, maximum and mean temperature of every HSN over windows of `window` steps, at the end of every window. The columns are named '<HSN> min', '<HSN> max' and '<HSN> mean'. A last, incomplete window is recorded when the simulation reaches its duration.
+        """
+        super().__init__()
+        self.window: int = window
+        self._count: int = 0
+
+    def names(self, hsnNames: List[str]) -> List[str]:
+        return [ f'{name} {statistic}' for name in hsnNames for statistic in ('min', 'max', 'mean') ]
+
+    def start(self, recorder: ResultBuffer):
+        super().start(recorder)
+        self._count = 0
+
+    def reserve(self, count: int):
+        self.recorder.reserve((self._count + count) // self.window + 1)
+
+    def record(self, time: float, temperature: np.ndarray):
+        if self._count == 0:
+            self._minimum = temperature.copy()
+            self._maximum = temperature.copy()
+            self._sum = temperature.copy()
+        else:
+            np.minimum(self._minimum, temperature, out=self._minimum)
+            np.maximum(self._maximum, temperature, out=self._maximum)
+            self._sum += temperature
+        self._count += 1
+        self._time = time
+        if self._count == self.window:
+            self._recordWindow()
+
+    def _recordWindow(self):
+        statistics = np.stack((self._minimum, self._maximum, self._sum / self._count), axis=-1)
+        self.recorder.record(self._time, statistics.ravel())
+        self._count = 0
+
+    def close(self, complete: bool = True):
+        if complete and self._count:
+            self._recordWindow()
+        super().close(complete)
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        if self._count == 0:
+            return { 'count': np.array(0) }
+        return {
+            'count': np.array(self._count),
+            'minimum': self._minimum,
+            'maximum': self._maximum,
+            'sum': self._sum,
+            'time': np.array(self._time),
+        }
+
+    def restore(self, snapshot: Dict[str, np.ndarray]):
+        self._count = int(snapshot['count'])
+        if self._count:
+            self._minimum = snapshot['minimum'].copy()
+            self._maximum = snapshot['maximum'].copy()
+            self._sum = snapshot['sum'].copy()
+            self._time = snapshot['time'][()]
+
+
+class RecordOnChange(RecordingPolicy):
+
+    def __init__(self, threshold: float):
+        """Only record a step once any HSN temperature changed by more than `threshold` since the last recorded step. The first and the last step are always recorded, the last one once the simulation reaches its duration."""
+        super().__init__()
+        self.threshold: float = threshold
+        self._last: np.ndarray = None
+        self._pending = None
+
+    def start(self, recorder: ResultBuffer):
+        super().start(recorder)
+        self._last = None
+        self._pending = None
+
+    def reserve(self, count: int):
+        # the number of recorded steps is not known in advance
+        pass
+
+    def record(self, time: float, temperature: np.ndarray):
+        if self._last is None or np.max(np.abs(temperature - self._last)) > self.threshold:
+            self.recorder.record(time, temperature)
+            self._last = temperature.copy()
+            self._pending = None
+        else:
+            self._pending = (time, temperature.copy())
+
+    def close(self, complete: bool = True):
+        if complete and self._pending is not None:
+            self.recorder.record(*self._pending)
+            self._pending = None
+        super().close(complete)
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        snapshot = {}
+        if self._last is not None:
+            snapshot['last'] = self._last
+        if self._pending is not None:
+            snapshot['pendingTime'] = np.array(self._pending[0])
+            snapshot['pendingTemperature'] = self._pending[1]
+        return snapshot
+
+    def restore(self, snapshot: Dict[str, np.ndarray]):
+        self._last = snapshot['last'].copy() if 'last' in snapshot else None
+        self._pending = None
+        if 'pendingTime' in snapshot:
+            self._pending = (snapshot['pendingTime'][()], snapshot['pendingTemperature'].copy())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from typing import Sequence
+import numpy as np
+
+
+class Schedule():
+
+    def __init__(self):
+        """
+        Value changing over time, such as the heat generation of an HSN following the duty cycle of its payload.
+
+        A schedule is given in place of a constant 'heatGeneration' HSN parameter. It is evaluated once for the start of every step when the model is compiled, such that a step only looks up its row of a dense array.
+
+        Methods:
+
+            - values(times)
+        """
+        pass
+
+    def values(self, times: np.ndarray) -> np.ndarray:
+        """Values at the given times (s)."""
+        raise NotImplementedError()
+
+
+class PiecewiseConstant(Schedule):
+
+    def __init__(self, breakpoints: Sequence[float], values: Sequence[float]):
+        """Every value holds from its breakpoint (s) until the next one. The first value also holds before the first breakpoint."""
+        super().__init__()
+        self.breakpoints: np.ndarray = np.asarray(breakpoints, dtype=np.float64)
+        self.levels: np.ndarray = np.asarray(values, dtype=np.float64)
+        if self.breakpoints.shape != self.levels.shape:
+            raise ValueError('Expected one value per breakpoint')
+        if np.any(np.diff(self.breakpoints) < 0):
+            raise ValueError('Breakpoints must be sorted')
+
+    def values(self, times: np.ndarray) -> np.ndarray:
+        index = np.searchsorted(self.breakpoints, times, side='right') - 1
+        return self.levels[np.clip(index, 0, None)]
+
+
+class Tabulated(Schedule):
+
+    def __init__(self, times: Sequence[float], values: Sequence[float]):
+        """Values given at the given times (s), linearly interpolated in between and held constant outside."""
+        super().__init__()
+        self.times: np.ndarray = np.asarray(times, dtype=np.float64)
+        self.samples: np.ndarray = np.asarray(values, dtype=np.float64)
+
+    def values(self, times: np.ndarray) -> np.ndarray:
+        return np.interp(times, self.times, self.samples)
+
+
+class Periodic(Schedule):
+
+    def __init__(self, schedule: Schedule, period: float, phase: float = 0):
+        """Repeat the first `period` seconds of another schedule, e.g. an orbit profile. The schedule is shifted by `phase` seconds."""
+        super().__init__()
+        self.schedule: Schedule = schedule
+        self.period: float = period
+        self.phase: float = phase
+
+    def values(self, times: np.ndarray) -> np.ndarray:
+        return self.schedule.values(np.mod(np.asarray(times) - self.phase, self.period))
+
+
+class DutyCycle(Periodic):
+
+    def __init__(self, period: float, onDuration: float, power: float, standby: float = 0, phase: float = 0):
+        """Generate `power` during the first `onDuration` seconds of every `period`, and `standby` otherwise."""
+        super().__init__(PiecewiseConstant([0, onDuration], [power, standby]), period, phase)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, List
+import numpy as np
+
+if TYPE_CHECKING:
+    from .thermalmodel import ThermalModel
+
+
+class StopCondition():
+
+    def __init__(self):
+        """
+        Ends a simulation before `simulation_duration` is reached, see `ThermalModel.simulate()`.
+
+        `check()` is called after every step with the array of HSN temperatures of the compiled model, and should only do a few vectorized operations on it. Once it returns True, `message` describes why the simulation stopped.
+
+        Methods:
+
+            - start(model)
+            - check(time, temperature)
+        """
+        self.message: str = None
+
+    def start(self, model: ThermalModel):
+        """Called before the simulation starts."""
+        self.message = None
+
+    def check(self, time: float, temperature: np.ndarray) -> bool:
+        raise NotImplementedError()
+
+
+class Converged(StopCondition):
+
+    def __init__(self, tolerance: float, every: int = 1):
+        """Stop once no HSN temperature changes faster than `tolerance` (K/s). The rate is measured over `every` steps, which also reduces the cost of the check."""
+        super().__init__()
+        self.tolerance: float = tolerance
+        self.every: int = every
+
+    def start(self, model: ThermalModel):
+        super().start(model)
+        self._previous: np.ndarray = model.engine.temperature.copy()
+        self._interval: float = self.every * model.timestep
+        self._count: int = 0
+
+    def check(self, time: float, temperature: np.ndarray) -> bool:
+        self._count += 1
+        if self._count < self.every:
+            return False
+        self._count = 0
+        rate = np.max(np.abs(temperature - self._previous)) / self._interval
+        self._previous[...] = temperature
+        if rate < self.tolerance:
+            self.message = f'Converged at t={time}: temperatures change by at most {rate:.3g} K/s'
+            return True
+        return False
+
+
+class TemperatureLimit(StopCondition):
+
+    def __init__(self, lower: float = None, upper: float = None, nodes: List[str] = None):
+        """Stop once the temperature (K) of any of the given HSN (all by default) leaves the range from `lower` to `upper`. Either bound may be omitted."""
+        super().__init__()
+        self.lower: float = -np.inf if lower is None else lower
+        self.upper: float = np.inf if upper is None else upper
+        self.nodes: List[str] = nodes
+
+    def start(self, model: ThermalModel):
+        super().start(model)
+        self._names: List[str] = model.index['HSN'].names
+        if self.nodes is None:
+            self._index = slice(None)
+        else:
+            self._index = model.index['HSN'].IDs(self.nodes)
+
+    def check(self, time: float, temperature: np.ndarray) -> bool:
+        watched = temperature[..., self._index]
+        if np.all(watched >= self.lower) and np.all(watched <= self.upper):
+            return False
+        violated = (watched < self.lower) | (watched > self.upper)
+        names = np.array(self._names)[self._index][violated.reshape(-1, violated.shape[-1]).any(axis=0)]
+        self.message = f'Temperature limits [{self.lower}, {self.upper}] K violated at t={time} by {names.tolist()}'
+        return True
+
+
+class Predicate(StopCondition):
+
+    def __init__(self, func: Callable[[float, np.ndarray], bool], message: str = 'Stop condition met'):
+        """Stop once `func(time, temperature)` returns True, given the array of HSN temperatures."""
+        super().__init__()
+        self.func: Callable[[float, np.ndarray], bool] = func
+        self.reason: str = message
+
+    def check(self, time: float, temperature: np.ndarray) -> bool:
+        if self.func(time, temperature):
+            self.message = f'{self.reason} at t={time}'
+            return True
+        return False
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from typing import Dict, List, Tuple, Type
+import copy
+import numpy as np
+import pandas as pd
+
+from .engine import CompiledModel
+from .environment import OrbitEnvironment
+from .recording import timeGrid
+from .nodes import LinkType
+from .thermalmodel import ThermalModel, setDescriptionParameter
+from .timeseries import TimeSeries
+
+
+class ParametricSweep():
+
+    def __init__(self, simulation_duration: float, timestep: float,
+                 model_description: List[
+                     Tuple[str, Dict, List[
+                         Tuple[str, Dict, List[
+                             Tuple[str, Tuple[str, str], List[Type[LinkType]], Dict]
+                         ]]
+                     ]]
+                 ],
+                 overrides: pd.DataFrame,
+                 environment: OrbitEnvironment = None,
+                 heat_generation: TimeSeries = None):
+        """
+        Simulate many variants of the same model at once.
+
+        Every variant is the given model description with some of its parameters replaced. All variants are compiled into a single model whose state is a (variants x HSN) array, such that each step advances all variants together using forward Euler.
+
+        Parameters:
+
+            - simulation_duration: float
+
+                See `ThermalModel`.
+
+            - timestep: float
+
+                See `ThermalModel`.
+
+            - model_description
+
+                See `ThermalModel`. The description itself is left untouched; every variant works on a copy.
+
+            - overrides: pandas.DataFrame
+
+                One row per variant (at least one), the index identifying the variant. Every column names the parameter to replace as a path (see `thermalmodel.setDescriptionParameter()`):
+
+                    'Battery/mass'
+
+                All variants must keep the same nodes and links, only parameter values may differ. Links with a `ManualLink` type, or any other link type evaluated through its objects (see `engine.CompiledModel`), are not supported: they read the nodes of a single model, not those of every variant.
+
+            - environment: OrbitEnvironment
+
+                See `ThermalModel`, shared by all variants.
+
+            - heat_generation: TimeSeries
+
+                See `ThermalModel`, shared by all variants. The HSN it covers ignore overrides of their 'heatGeneration'.
+
+        Methods:
+
+            - timeGrid()
+            - run()
+            - simulate()
+        """
+        self.duration: float = simulation_duration  # seconds
+        self.timestep: float = timestep  # seconds
+        self.overrides: pd.DataFrame = overrides
+        if overrides.shape[0] == 0:
+            raise ValueError('The overrides must hold at least one variant')
+
+        engines = []
+        for _, row in overrides.iterrows():
+            description = copy.deepcopy(model_description)
+            for path, value in row.items():
+                setDescriptionParameter(description, path, value)
+            engine = ThermalModel(simulation_duration, timestep, description,
+                                  environment=environment, heat_generation=heat_generation).engine
+            if engine.manualLinks:
+                raise ValueError('Models with ManualLink functions or custom link types cannot be swept, simulate every variant as a ThermalModel instead')
+            engines.append(engine)
+
+        self.hsnNames: List[str] = [ nameHSN for nameHSN, _, _ in model_description ]
+        self.engine: CompiledModel = _stack(engines)
+
+        self.temperatureReadings: pd.DataFrame = pd.DataFrame(columns=['variant', 'time', 'HSN', 'temperature'])
+
+    def timeGrid(self) -> np.ndarray:
+        """Times of the readings, the same as `ThermalModel.simulate()` uses."""
+        return timeGrid(self.duration, self.timestep)
+
+    def run(self) -> np.ndarray:
+        """Run all variants and return their temperatures at every time of `timeGrid()`, as a (times x variants x HSN) array."""
+        steps = len(self.timeGrid())
+        readings = np.empty((steps, *self.engine.temperature.shape))
+        for i in range(steps):
+            readings[i] = self.engine.step()
+        return readings
+
+    def simulate(self) -> pd.DataFrame:
+        """Run all variants and return the readings as a tidy DataFrame with the columns 'variant', 'time', 'HSN' and 'temperature'."""
+        times = self.timeGrid()
+        steps = len(times)
+        readings = self.run()
+
+        countVariants, countHSN = readings.shape[1:]
+        self.temperatureReadings = pd.DataFrame({
+            'variant': np.tile(np.repeat(self.overrides.index.to_numpy(), countHSN), steps),
+            'time': np.repeat(times, countVariants * countHSN),
+            'HSN': np.tile(self.hsnNames, steps * countVariants),
+            'temperature': readings.ravel(),
+        })
+        return self.temperatureReadings
+
+
+def _stack(engines: List[CompiledModel]) -> CompiledModel:
+    # merge the compiled variants into the first one, adding a leading 'variant' axis
+    stacked = engines[0]
+    for engine in engines[1:]:
+        for name in ('ifnHSN', 'linearNode1', 'linearNode2', 'radiationNode1', 'radiationNode2', 'scheduleNodes', 'heatGenerationNodes'):
+            if not np.array_equal(getattr(engine, name), getattr(stacked, name)):
+                raise ValueError('All variants of a sweep must have the same nodes and links')
+    for name in ('temperature', 'capacity', 'heatGeneration', 'linearConductance', 'radiationFactor'):
+        setattr(stacked, name, np.stack([ getattr(engine, name) for engine in engines ]))
+    if stacked.environmentLoad is not None:
+        # (steps x variants x IFN), such that every step selects the loads of all variants
+        stacked.environmentLoad = np.stack([ engine.environmentLoad for engine in engines ], axis=1)
+        stacked.environmentEmission = np.stack([ engine.environmentEmission for engine in engines ])
+    if stacked.scheduledHeatGeneration is not None:
+        stacked.scheduledHeatGeneration = np.stack([ engine.scheduledHeatGeneration for engine in engines ], axis=1)
+    # the heat generation series is the same input for all variants, its rows apply to every one of them
+    return stacked
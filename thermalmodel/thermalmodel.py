@@ -1,14 +1,27 @@
 #!/usr/bin/env python3
 
+from __future__ import annotations
 from typing import Dict, List, Tuple, Type
 import numpy as np
 import pandas as pd
 import itertools
+import os
 
 import plotly.express as px
 
-from .nodes import HeatStorageNode, InterfaceNode, LinkType, Node
-from .links import Link, ManualLink
+from .nodes import HeatStorageNode, LinkType
+from .links import InverseLink, Link
+from .checkpoint import loadCheckpoint, prefixed, readingsFilename, saveCheckpoint, unprefixed
+from .modelfile import loadModelFile, saveModelFile
+from .naming import NameIndex
+from .engine import BACKENDS, CompiledModel
+from .environment import OrbitEnvironment
+from .schedules import Schedule
+from .stopping import StopCondition
+from .timeseries import TimeSeries
+from .integrators import INTEGRATORS, Integrator
+from .profiling import Profiler
+from .recording import RecordingPolicy, ResultBuffer, StreamingRecorder, timeChunks
 
 
 class ThermalModel():
@@ -20,7 +33,12 @@ class ThermalModel():
                              Tuple[str, Tuple[str, str], List[Type[LinkType]], Dict]
                          ]]
                      ]]
-                 ]):
+                 ],
+                 backend: str = 'numpy',
+                 integrator: str = 'euler',
+                 integrator_options: Dict = None,
+                 environment: OrbitEnvironment = None,
+                 heat_generation: TimeSeries = None):
         """
         The main ThermalModel incorporating all sub-components.
 
@@ -97,14 +115,53 @@ class ThermalModel():
                         ])
                     ]
 
+            - backend: str
+
+                How the compiled model evaluates the links (see `engine.BACKENDS`). Use 'numpy' (default) for small models and 'sparse' for large, sparsely connected models with thousands of IFN.
+
+            - integrator: str
+
+                How the temperatures are advanced in time (see `integrators.INTEGRATORS`). Use 'euler' (default) for the explicit forward Euler method, 'backward-euler'/'crank-nicolson' for the implicit methods, which remain stable for much larger timesteps on stiff models (small masses, high conductivities), or 'adaptive' for variable internal step sizes with error control. The readings are always reported every `timestep` seconds.
+
+            - integrator_options: Dict
+
+                Additional settings for the chosen integrator, such as 'jacobianTolerance' for the implicit methods or 'method'/'rtol'/'atol' for the adaptive one.
+
+            - environment: OrbitEnvironment
+
+                External loads from the sun, the Earth and deep space (see `environment.OrbitEnvironment`). They are precomputed for the whole `simulation_duration` upon compilation. The IFN parameters 'area', 'sunAccess', 'earthAccess' and 'spaceAccess' define how each IFN is exposed.
+
+            - heat_generation: TimeSeries
+
+                Heat generation (W) of the HSN over time, one column per HSN named after it (see `timeseries.TimeSeries.fromFile()` for reading large profiles from memory-mapped files). These HSN ignore their 'heatGeneration' parameter.
+
+                Heat generation changing over time can also be given per HSN, as a `schedules.Schedule` (e.g. `DutyCycle`, `PiecewiseConstant`, `Tabulated`, `Periodic`) in place of the constant 'heatGeneration' parameter.
+
         Methods:
 
+            - compile()
+            - invalidate()
+            - setParameter()
             - simulate()
+            - solve_steady_state()
+            - export(filename)
+            - fromFile(filename)
+            - ID2label(kind, ID)
+            - label2ID(kind, label)
 
         """
 
         self.duration: float = simulation_duration  # seconds
         self.timestep: float = timestep  # seconds
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {list(BACKENDS)}")
+        self.backend: str = backend
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator '{integrator}', expected one of {list(INTEGRATORS)}")
+        self.integratorName: str = integrator
+        self.integratorOptions: Dict = integrator_options or {}
+        self.environment: OrbitEnvironment = environment
+        self.heatGenerationSeries: TimeSeries = heat_generation
 
         self.heatStorageNodes: Dict[str, HeatStorageNode] = {}
         # number of nodes/links
@@ -112,6 +169,8 @@ class ThermalModel():
         # map nodes/links to numeric IDs for use on matrices
         # also see 'ID2label()' and 'label2ID()' functions
         self.IDmap: Dict[str, List[Tuple[str, int]]] = { 'HSN': [], 'IFN': [], 'links': [] }
+        # name <-> ID lookups in both directions, IFN and links named by their path
+        self.index: Dict[str, NameIndex] = { 'HSN': NameIndex(), 'IFN': NameIndex(), 'links': NameIndex() }
 
         # create all HSN nodes
         self._addHeatStorageNodes([ (nameHSN, paramsHSN) for nameHSN, paramsHSN, _ in model_description ])
@@ -137,9 +196,16 @@ class ThermalModel():
                 self.IDmap['links'] += [ (nameLink, next(linkID)) for (nameLink, _, _, _) in linksIFN ]
         del linkID
 
-        self.temperatureReadings: pd.DataFrame = pd.DataFrame(columns=[
-            'time', *[ hsnName for hsnName, _ in self.IDmap['HSN'] ],
-        ])
+        # temperatures recorded by simulate(), also see 'temperatureReadings'
+        self.results: ResultBuffer = ResultBuffer([ hsnName for hsnName, _ in self.IDmap['HSN'] ], np.result_type(self.timestep))
+        # condition which ended the last simulation early, if any
+        self.stoppedBy: StopCondition = None
+        # model file the model was loaded from, see fromFile()
+        self.modelFile: str = None
+
+        self.engine: CompiledModel
+        self.integrator: Integrator
+        self.compile()
 
     def _addHeatStorageNodes(self, nodes: List[Tuple[str, Dict]]):
         for nodeHSN in nodes:
@@ -148,77 +214,415 @@ class ThermalModel():
                 raise KeyError(f"HSN named '{nameHSN}' already exists in ThermalModel")
             parameters['timestep'] = self.timestep
             self.heatStorageNodes[nameHSN] = HeatStorageNode(parameters=parameters)
+            self.index['HSN'].add(nameHSN, self.heatStorageNodes[nameHSN])
 
     def _addInterfaceNodes(self, nameHSN: str, nodes: List[Tuple[str, Dict]]):
         for nodeIFN in nodes:
             nameIFN, parameters = nodeIFN
-            self.heatStorageNodes[nameHSN].addInterfaceNode(nameIFN, parameters=parameters)
+            createdNode = self.heatStorageNodes[nameHSN].addInterfaceNode(nameIFN, parameters=parameters)
+            self.index['IFN'].add(f'{nameHSN}/{nameIFN}', createdNode)
 
     def _addInterfaceLinks(self, nameHSN: str, nameIFN: str,
                            links_definition: List[Tuple[str, Tuple[str, str], List[Type[LinkType]], Dict]]):
-        givenLinks: List[Tuple[Tuple[str, str], Tuple[str, str], str]] = []
+        givenLinks: List[Tuple[Tuple[str, str], Tuple[str, str], str, Link]] = []
         for link in links_definition:
             nameLink, (nameTargetHSN, nameTargetIFN), linkTypes, parameters = link
-            self.heatStorageNodes[nameHSN].addInterfaceLink(
+            createdLink = self.heatStorageNodes[nameHSN].addInterfaceLink(
                 nameLink,
                 nameIFN,
                 self.heatStorageNodes[nameTargetHSN].interfaces[nameTargetIFN],
                 linkTypes,
                 parameters
             )
+            self.index['links'].add(f'{nameHSN}/{nameIFN}/{nameLink}', createdLink)
             # keep track of defined links
-            givenLinks.append(( (nameHSN, nameIFN), (nameTargetHSN, nameTargetIFN), nameLink ))
+            givenLinks.append(( (nameHSN, nameIFN), (nameTargetHSN, nameTargetIFN), nameLink, createdLink ))
         # create inverse links
         for link in givenLinks:
-            (nameHSN, nameIFN), (nameTargetHSN, nameTargetIFN), nameLink = link
+            (nameHSN, nameIFN), (nameTargetHSN, nameTargetIFN), nameLink, createdLink = link
             self.heatStorageNodes[nameTargetHSN].addInterfaceLink(
                 nameLink + '-inversed',
                 nameTargetIFN,
                 self.heatStorageNodes[nameHSN].interfaces[nameIFN],
-                [ ManualLink ],
-                { 'func': lambda: -1 * self.heatStorageNodes[nameHSN].interfaces[nameIFN].interfaceLinks[nameLink].computeHeatExchange() }
+                [ InverseLink ],
+                { 'link': createdLink }
             )
 
-    def simulate(self):
+    @classmethod
+    def fromFile(cls, filename: str, backend: str = 'numpy', integrator: str = 'euler',
+                 integrator_options: Dict = None) -> ThermalModel:
+        """
+        Load a model written by `export()`, skipping the construction of the HSN/IFN/link objects and their compilation.
+
+        The model simulates exactly like the exported one, for the same `simulation_duration` and `timestep`. Without the objects, it cannot be changed by `setParameter()`, `invalidate()` or `compile()`.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {list(BACKENDS)}")
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator '{integrator}', expected one of {list(INTEGRATORS)}")
+        content = loadModelFile(filename)
+        names = content['names']
+
+        model = cls.__new__(cls)
+        model.duration = content['duration']
+        model.timestep = content['timestep']
+        model.backend = backend
+        model.integratorName = integrator
+        model.integratorOptions = integrator_options or {}
+        model.environment = None
+        model.heatGenerationSeries = None
+        model.heatStorageNodes = {}
+        # IFN and links are stored by their path, see NameIndex
+        model.index = { kind: NameIndex(names[kind]) for kind in ('HSN', 'IFN', 'links') }
+        model.IDmap = {
+            kind: [ (path.rsplit('/', 1)[-1], ID) for ID, path in enumerate(names[kind]) ]
+            for kind in ('HSN', 'IFN', 'links')
+        }
+        model.counters = { kind: len(names[kind]) for kind in ('HSN', 'IFN', 'links') }
+        model.results = ResultBuffer(names['HSN'], np.result_type(model.timestep))
+        model.stoppedBy = None
+        model.modelFile = filename
+        model.engine = BACKENDS[backend].fromArrays(content['arrays'], model.timestep, content['linkTypeCounts'])
+        model.integrator = INTEGRATORS[integrator](model.engine, model.integratorOptions)
+        model._lastTime = None
+        model._streamed = None
+        model._recording = None
+        return model
+
+    def export(self, filename: str):
+        """
+        Write the compiled model into a binary model file (see `modelfile`), to be loaded by `fromFile()`.
+
+        The file holds the arrays of the compiled model, with the current temperatures, and the names of the HSN, IFN and links (see `index`). Schedules, time series and environment loads are stored as evaluated for the `simulation_duration` and `timestep` of the model. Models with `ManualLink` functions cannot be exported.
+        """
+        saveModelFile(
+            filename,
+            self.engine.arrays(),
+            { kind: self.index[kind].names for kind in ('HSN', 'IFN', 'links') },
+            self.duration,
+            self.timestep,
+            self.engine.linkTypeCounts,
+        )
+
+    def ID2label(self, kind: str, ID: int) -> str:
+        """Name of the HSN, IFN or link (`kind` being 'HSN', 'IFN' or 'links') with the given ID. IFN and links are named by their path, e.g. 'Battery/BAT-top/BAT-BC'."""
+        return self.index[kind].name(ID)
+
+    def label2ID(self, kind: str, label: str) -> int:
+        """ID of the HSN, IFN or link with the given name, see `ID2label()`."""
+        return self.index[kind].ID(label)
+
+    def _requireNodes(self, action: str):
+        if self.modelFile is not None:
+            raise ValueError(f"Cannot {action} a model loaded from '{self.modelFile}', build it from its model_description instead")
+
+    def compile(self) -> CompiledModel:
+        """Flatten the HSN/IFN/link graph into the arrays used by `simulate()`. The next simulation starts over at time 0, from the current temperatures of the HSN."""
+        self._requireNodes('compile')
+        self.engine = BACKENDS[self.backend](self)
+        self.integrator = INTEGRATORS[self.integratorName](self.engine, self.integratorOptions)
+        # time of the last simulated step, and the file it was streamed to with its size, see simulate()
+        self._lastTime: float = None
+        self._streamed: Tuple[str, int] = None
+        # recording policy of the last simulation, whose state a continuation carries on with
+        self._recording: RecordingPolicy = None
+        return self.engine
+
+    def invalidate(self) -> CompiledModel:
+        """
+        Recompute the cached link coefficients and recompile the model.
+
+        The conductances and radiation factors of the links are computed once when the model is built. Call this after changing link parameters or IFN emissivities of an existing model, e.g. during parametric sweeps.
+        """
+        for hsn in self.heatStorageNodes.values():
+            for ifn in hsn.interfaces.values():
+                for link in ifn.interfaceLinks.values():
+                    link.invalidate()
+        return self.compile()
+
+    # model parameters and the node attributes they are stored in
+    _hsnAttributes: Dict[str, str] = {
+        'mass': 'mass',
+        'heatCapacity': 'heatCapacity',
+        'heatGeneration': 'heatGeneration',
+        'temperature': '_temperature',
+    }
+    _ifnAttributes: Dict[str, str] = {
+        'emissivity': '_emissivity',
+        'absorptivity': '_absorptivity',
+        'area': '_area',
+        'sunAccess': '_sunAccess',
+        'earthAccess': '_earthAccess',
+        'spaceAccess': '_spaceAccess',
+    }
+
+    def setParameter(self, path: str, value):
+        """
+        Change a single parameter of the built model, addressing it like `setDescriptionParameter()`:
+
+            'Battery/mass'                          (HSN parameter)
+            'Battery/BAT-top/emissivity'            (IFN parameter)
+            'Battery/BAT-top/BAT-BC/resistance'     (link parameter)
+
+        Only the coefficients depending on the parameter are recomputed in the compiled model. The current temperatures and the integrator are kept, such that the simulation can continue from where it is. Setting an HSN 'temperature' changes its current temperature.
+
+        Parameters none of the link types of a link read (see `LinkType.PARAMETERS`), and the '-inversed' links generated by the model, raise a KeyError.
+        """
+        self._requireNodes('change the parameters of')
+        *names, parameter = path.split('/')
+        try:
+            hsn = self.heatStorageNodes[names[0]]
+            ifn = hsn.interfaces[names[1]] if len(names) > 1 else None
+            link = ifn.interfaceLinks[names[2]] if len(names) > 2 else None
+        except (IndexError, KeyError):
+            raise KeyError(f"Parameter '{path}' does not name any HSN, IFN or link") from None
+        if len(names) > 3:
+            raise KeyError(f"Parameter '{path}' does not name any HSN, IFN or link")
+
+        if link is not None:
+            if any(isinstance(linkType, InverseLink) for linkType in link.linkTypes):
+                raise KeyError(f"Link '{names[2]}' mirrors another link, change the parameters of that link instead")
+            if not any(parameter in linkType.PARAMETERS for linkType in link.linkTypes):
+                typeNames = [ type(linkType).__name__ for linkType in link.linkTypes ]
+                raise KeyError(f"Unknown parameter '{parameter}' for a link of the types {typeNames}")
+            link.parameters[parameter] = value
+            self.engine.updateLink(link)
+        elif ifn is not None:
+            if parameter not in self._ifnAttributes:
+                raise KeyError(f"Unknown IFN parameter '{parameter}'")
+            setattr(ifn, self._ifnAttributes[parameter], value)
+            self.engine.updateInterfaceNode(ifn)
+        else:
+            if parameter not in self._hsnAttributes:
+                raise KeyError(f"Unknown HSN parameter '{parameter}'")
+            hsn.parameters[parameter] = value
+            previous = getattr(hsn, self._hsnAttributes[parameter])
+            setattr(hsn, self._hsnAttributes[parameter], value)
+            if parameter == 'temperature':
+                self.engine.temperature[self.index['HSN'].ID(names[0])] = value
+            elif isinstance(value, Schedule) or isinstance(previous, Schedule):
+                # schedules are evaluated upon compilation
+                self._recompile()
+            else:
+                self.engine.updateHeatStorageNode(hsn)
+        self.integrator.invalidate()
+
+    def _recompile(self):
+        # compile anew, carrying the state over into the new engine
+        previous = self.engine
+        self.engine = BACKENDS[self.backend](self)
+        self.engine.temperature[:] = previous.temperature
+        self.engine.stepIndex = previous.stepIndex
+        self.integrator.engine = self.engine
+
+    def simulate(self, filename: str = None, flushEvery: int = 10000, recording: RecordingPolicy = None,
+                 stop: List[StopCondition] = None,
+                 checkpoint: str = None, checkpointEvery: int = 10000, resume: bool = False,
+                 profiler: Profiler = None):
+        """
+        Run the simulation, recording the HSN temperatures every timestep.
+
+        The simulation runs from the step the model is at until `simulation_duration` is reached. Calling it again after a stop condition ended it early continues from there with the loads of the following steps, e.g. after changing parameters with `setParameter()`, and appends to `results`, or to the file the readings were streamed to. Once the duration is reached, further calls raise a ValueError; `compile()` the model to start over.
+
+        Parameters:
+
+            - filename: str
+
+                If given, stream the readings to this file (CSV, or Parquet if `pyarrow` is installed) while the simulation runs, instead of keeping them in `results`. Use this for very long simulations, whose readings would not fit in memory. A simulation continuing after a stop condition appends to the file the earlier readings were streamed to, and raises a ValueError for any other file.
+
+            - flushEvery: int
+
+                Number of readings kept in memory before they are written to `filename`.
+
+            - recording: RecordingPolicy
+
+                Which readings to keep, e.g. `RecordEveryNth(100)`, `RecordWindowStatistics(100)` or `RecordOnChange(0.1)` from `thermalmodel.recording`. Records every step by default. A simulation continuing after a stop condition carries on with the state of the policy of the stopped one, given a policy of the same type, such that it records the same readings as an uninterrupted simulation.
+
+            - stop: List[StopCondition]
+
+                End the simulation early, as soon as any of these conditions is met, e.g. `Converged(1e-5)`, `TemperatureLimit(upper=C2K(60))` or `Predicate(func)` from `thermalmodel.stopping`. The condition that ended the simulation is kept in `stoppedBy`.
+
+            - checkpoint: str
+
+                Save the state of the simulation to this file every `checkpointEvery` steps (see `thermalmodel.checkpoint`): the temperatures, the time, the position in the time-varying inputs, the number of readings recorded in memory or the size of the streamed file, the state of the recording policy and the linearization of the implicit integrators. Checkpoints hold plain arrays only. The readings recorded in memory are appended to '<checkpoint>.readings', every checkpoint only writing those recorded since the previous one, such that checkpointing costs the same per step however long the run.
+
+            - resume: bool
+
+                Continue from the state saved in `checkpoint`, if the file exists, e.g. after the process got killed. The model must have been built from the same description, and the simulation be called with the same arguments. Stop conditions start over from the saved state. The fixed-step integrators continue exactly like an uninterrupted run; the adaptive one restarts its solver, such that its results agree within its tolerances.
+
+            - profiler: Profiler
+
+                Measure the time spent per stage of a step (link kernels, Jacobian, HSN update, recording) and the time of every step, see `thermalmodel.profiling`. The report is printed after the simulation, and stays available from the profiler. Without a profiler, the simulation runs no instrumentation at all.
+        """
         # print('Counters:', self.counters)
         # print('IDs:', self.IDmap)
 
-        t = 0
-        temperatureReading: Dict[str, List[float]] = { c: [] for c in self.temperatureReadings.columns }
-        while t < self.duration:
-            t += self.timestep
-            temperatureReading['time'].append(t)
-            for heatStorageNode in self.heatStorageNodes.items():
-                name, HSN = heatStorageNode
-                temperature = HSN.computeTemperature()
-                temperatureReading[name].append(temperature)
-        self._addTemperatureReading(temperatureReading)
-        print(self.temperatureReadings)
+        if recording is None:
+            recording = RecordingPolicy()
+        names = recording.names(list(self.index['HSN'].names))
+        timeType = np.result_type(self.timestep)
+        steps = int(np.ceil(self.duration / self.timestep)) + 1
+
+        state = None
+        start = None
+        if resume and checkpoint is not None and os.path.exists(checkpoint):
+            state = self._restoreCheckpoint(checkpoint, recording)
+            start = state['time'][()]
+        elif self.engine.stepIndex > 0:
+            # continue where the last simulation ended
+            start = self._lastTime
+        if start is not None and start >= self.duration:
+            raise ValueError(f'The simulation already reached its duration of {self.duration} s, compile() the model to start over')
+
+        if filename is None:
+            if names != self.results.names or state is not None or start is None:
+                self.results = ResultBuffer(names, timeType)
+            recorder = self.results
+            if state is not None:
+                recorder.restore(state, readingsFilename(checkpoint))
+        else:
+            resumeAt = None
+            if state is not None:
+                resumeAt = int(state['filePosition'])
+            elif start is not None:
+                # append to the readings streamed so far
+                if self._streamed is None or self._streamed[0] != filename:
+                    raise ValueError(f"Cannot continue the simulation into '{filename}', the readings so far were not streamed to it")
+                resumeAt = self._streamed[1]
+            recorder = StreamingRecorder(names, filename, flushEvery, timeType, resumeAt)
+            steps = flushEvery
+        stop = stop or []
+        for condition in stop:
+            condition.start(self)
+        self.stoppedBy = None
+        previous = self._recording
+        if state is not None:
+            recording.recorder = recorder
+        elif start is not None and previous is not None and type(previous) is type(recording):
+            # carry on with the state the policy had when the last simulation stopped
+            if previous is not recording:
+                recording.restore(previous.snapshot())
+            recording.recorder = recorder
+        else:
+            recording.start(recorder)
+        self._recording = recording
+        record = recording.record
+        if profiler is not None:
+            record = profiler.attach(self, record)
+        time = start
+        try:
+            for times in timeChunks(self.duration, self.timestep, steps, start):
+                recording.reserve(len(times))
+                for time in times:
+                    temperature = self.integrator.step()
+                    record(time, temperature)
+                    if stop:
+                        self.stoppedBy = next(( condition for condition in stop if condition.check(time, temperature) ), None)
+                        if self.stoppedBy is not None:
+                            break
+                    if checkpoint is not None and self.engine.stepIndex % checkpointEvery == 0:
+                        self._saveCheckpoint(checkpoint, time, recording, recorder)
+                if self.stoppedBy is not None:
+                    break
+        finally:
+            self._lastTime = time
+            recording.close(complete=self.stoppedBy is None)
+            self._streamed = None if filename is None else (filename, os.path.getsize(filename))
+            if profiler is not None:
+                profiler.detach()
+        self.engine.writeBack(self)
+        if self.stoppedBy is not None:
+            print(self.stoppedBy.message)
+        if filename is None:
+            print(self.temperatureReadings)
+        else:
+            print(f'Streamed data to file {filename}')
+        if profiler is not None:
+            print(profiler.report())
+
+    def _saveCheckpoint(self, filename: str, time: float, recording: RecordingPolicy, recorder: ResultBuffer):
+        saveCheckpoint(filename, {
+            'temperature': self.engine.temperature,
+            'stepIndex': np.array(self.engine.stepIndex),
+            'time': np.array(time),
+            'recordingPolicy': np.array(type(recording).__name__),
+            **prefixed('recording', recording.snapshot()),
+            **prefixed('integrator', self.integrator.snapshot()),
+            **recorder.snapshot(readingsFilename(filename)),
+        })
+
+    def _restoreCheckpoint(self, filename: str, recording: RecordingPolicy) -> Dict[str, np.ndarray]:
+        state = loadCheckpoint(filename)
+        if state['temperature'].shape != self.engine.temperature.shape:
+            raise ValueError(f"Checkpoint '{filename}' does not match the nodes of the model")
+        saved = str(state['recordingPolicy'])
+        if saved != type(recording).__name__:
+            raise ValueError(f"Checkpoint '{filename}' was recorded with {saved}, not {type(recording).__name__}")
+        recording.restore(unprefixed('recording', state))
+        self.engine.temperature[...] = state['temperature']
+        self.engine.stepIndex = int(state['stepIndex'])
+        self.integrator.invalidate()
+        self.integrator.restore(unprefixed('integrator', state))
+        return state
+
+    def solve_steady_state(self, tolerance: float = 1e-6, max_iterations: int = 100, step: int = None,
+                           heat_tolerance: float = 1e-6) -> pd.Series:
+        """
+        Equilibrium temperatures of the HSN, solved directly from the energy balance instead of simulating until they settle.
+
+        Uses Newton's method on the net heat of every HSN, starting from the current temperatures (see `CompiledModel.steadyState()`). Time-varying loads (schedules, time series, environment) are taken at the given step, by default the one the simulation is at. The model itself is left untouched.
+
+        Parameters:
+
+            - tolerance: float
+
+                Largest temperature change (K) of the last iteration.
+
+            - heat_tolerance: float
+
+                Largest net heat (W) left going into any HSN.
+
+            - max_iterations: int
+
+                Raise a RuntimeError if not converged after this many iterations.
+
+            - step: int
+
+                Index of the step whose loads are used, e.g. to look at the hot and cold cases of an orbit.
+
+        Returns the temperatures (K) as a Series indexed by the HSN names.
+        """
+        temperature = self.engine.steadyState(stepIndex=step, tolerance=tolerance, heatTolerance=heat_tolerance,
+                                             maxIterations=max_iterations)
+        return pd.Series(temperature, index=self.index['HSN'].names, name='temperature')
+
+    @property
+    def temperatureReadings(self) -> pd.DataFrame:
+        """The temperatures recorded by `simulate()` as a DataFrame, built from `results` upon access."""
+        return self.results.dataFrame()
 
     def save(self, filename='thermalmodel.csv'):
         print(f'Saving data to file {filename}')
-        self.temperatureReadings.to_csv(filename, index=False)
+        readings = self.temperatureReadings
+        readings.to_csv(filename, index=False)
 
     def plotfig(self):
         """Make a plot of the temperatures evolving"""
         # rearrange dataframe for plotly
+        # temperatureReadings builds a new DataFrame upon every access
+        readings = self.temperatureReadings
+        times = readings['time'].tolist()
         df = pd.DataFrame(columns=['time', 'temperature', 'HSN'])
-        for col in self.temperatureReadings.columns[1:]:
+        for col in readings.columns[1:]:
             # ignoring first column 'time'
             df = pd.concat([ df, pd.DataFrame({
-                'time': self.temperatureReadings['time'].tolist(),
-                'temperature': self.temperatureReadings[col].tolist(),
+                'time': times,
+                'temperature': readings[col].tolist(),
                 'HSN': col,
             }) ])
         fig = px.line(df, x='time', y='temperature', color='HSN')
         fig.show()
 
-    def _addTemperatureReading(self, reading: Dict[str, List[float]]):
-        self.temperatureReadings = pd.concat(
-            [ self.temperatureReadings, pd.DataFrame(reading) ],
-            ignore_index=True,
-        )
-
     def display(self):
         """Print the internal representation of the thermal model. Mainly needed for debugging purposes."""
         indentspaces = {
@@ -233,13 +637,8 @@ class ThermalModel():
             if level == 'link':
                 for k, v in parameters.items():
                     if k == 'node1' or k == 'node2':
-                        ifn: InterfaceNode = v
-                        hsn: HeatStorageNode = ifn.referenceNode
-                        hsn_ifn_element: Tuple[str, InterfaceNode] = tuple(filter(
-                            lambda i: i[1] is v,
-                            hsn.interfaces.items()
-                        ))[0]
-                        v = '{} {}'.format(hsn_ifn_element[0], hsn_ifn_element[1])
+                        ifnName, _ = self.IDmap['IFN'][self.index['IFN'].objectID(v)]
+                        v = '{} {}'.format(ifnName, v)
                     print('{}{}: {}'.format(paramsindent[level], k, v))
                 return
             for k, v in parameters.items():
@@ -256,3 +655,27 @@ class ThermalModel():
                 for linkName, link in ifn.interfaceLinks.items():
                     print('{}{}'.format(indent['link'], linkName))
                     printParams(link.parameters, 'link')
+
+
+def setDescriptionParameter(model_description: List, path: str, value):
+    """
+    Set a parameter in a model description (see `ThermalModel`), addressing it by a path using '/' as separator:
+
+        'Battery/mass'                          (HSN parameter)
+        'Battery/BAT-top/emissivity'            (IFN parameter)
+        'Battery/BAT-top/BAT-BC/resistance'     (link parameter)
+    """
+    *names, parameter = path.split('/')
+    level = model_description
+    parameters = None
+    for name in names:
+        matches = [ element for element in level if element[0] == name ]
+        if not matches:
+            raise KeyError(f"No element named '{name}' for parameter '{path}'")
+        element = matches[0]
+        # links are (name, target, linkTypes, parameters), nodes are (name, parameters, children)
+        parameters = element[3] if len(element) == 4 else element[1]
+        level = element[2]
+    if parameters is None:
+        raise KeyError(f"Parameter '{path}' does not name any HSN, IFN or link")
+    parameters[parameter] = value
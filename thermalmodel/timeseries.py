@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+from typing import List
+import csv
+import os
+import numpy as np
+import pandas as pd
+
+
+class TimeSeries():
+
+    def __init__(self, values: np.ndarray, columns: List[str], sampleInterval: float = 1):
+        """
+        Tabulated input values over time, such as heat generation profiles or the sun elevation.
+
+        The values are kept as they are given, i.e. a memory-mapped array (see `fromFile()`) is only read from the disk as the simulation reaches the corresponding rows.
+
+        Parameters:
+
+            - values: numpy.ndarray
+
+                (samples x columns) array, one row every `sampleInterval` seconds, starting at time 0.
+
+            - columns: List[str]
+
+                Name of every column, e.g. the HSN whose heat generation it holds.
+
+            - sampleInterval: float
+
+                Seconds between two rows. Every row holds from its time until the next row (zero-order hold).
+
+        Methods:
+
+            - fromFile(filename)
+            - column(name)
+            - rows(times)
+        """
+        self.values: np.ndarray = values
+        if values.ndim != 2 or values.shape[1] != len(columns):
+            raise ValueError(f'Expected {len(columns)} columns of values, got an array of shape {values.shape}')
+        self.columns: List[str] = list(columns)
+        self.sampleInterval: float = sampleInterval
+
+    @classmethod
+    def fromFile(cls, filename: str, columns: List[str] = None, sampleInterval: float = 1,
+                 cacheDirectory: str = None) -> TimeSeries:
+        """
+        Memory-map a time series from a `.npy` or `.csv` file.
+
+        A CSV file is converted once into a binary `.npy` cache (next to the CSV, or in `cacheDirectory`), which is memory-mapped from then on. The cache is rebuilt whenever the CSV is modified. The column names are taken from the header of the CSV unless `columns` is given, which is required for `.npy` files.
+        """
+        extension = os.path.splitext(filename)[1].lower()
+        if extension == '.npy':
+            if columns is None:
+                raise ValueError(f"Column names are required for '{filename}'")
+            values = np.load(filename, mmap_mode='r')
+        elif extension == '.csv':
+            header = _readHeader(filename)
+            cacheFilename = _cacheFilename(filename, cacheDirectory)
+            if not os.path.exists(cacheFilename) or os.path.getmtime(cacheFilename) < os.path.getmtime(filename):
+                _convertCSV(filename, cacheFilename, len(header))
+            values = np.load(cacheFilename, mmap_mode='r')
+            columns = header if columns is None else columns
+        else:
+            raise ValueError(f"Cannot read time series from '{filename}', expected a .npy or .csv file")
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+        return cls(values, columns, sampleInterval)
+
+    @property
+    def duration(self) -> float:
+        """Time (s) up to which the series holds values."""
+        return self.values.shape[0] * self.sampleInterval
+
+    def column(self, name: str) -> np.ndarray:
+        """The values of a single column."""
+        return self.values[:, self.columns.index(name)]
+
+    def rows(self, times: np.ndarray) -> np.ndarray:
+        """Index of the row holding at each of the given times (s)."""
+        # tolerate rounding errors of times lying on a sample
+        rows = np.floor(np.asarray(times) / self.sampleInterval + 1e-9).astype(np.intp)
+        if rows.size and (rows.min() < 0 or rows.max() >= self.values.shape[0]):
+            raise ValueError(f'Time series only covers {self.duration} seconds')
+        return rows
+
+
+def _readHeader(filename: str) -> List[str]:
+    with open(filename, newline='') as file:
+        return next(csv.reader(file))
+
+
+def _cacheFilename(filename: str, cacheDirectory: str = None) -> str:
+    if cacheDirectory is None:
+        return filename + '.npy'
+    return os.path.join(cacheDirectory, os.path.basename(filename) + '.npy')
+
+
+def _convertCSV(filename: str, cacheFilename: str, countColumns: int, chunksize: int = 100000):
+    # stream the CSV into a memory-mapped .npy file, without holding it in memory at once
+    with open(filename, 'rb') as file:
+        countRows = sum(1 for line in file if line.strip()) - 1
+    temporary = cacheFilename + '.tmp'
+    values = np.lib.format.open_memmap(temporary, mode='w+', dtype=np.float64, shape=(countRows, countColumns))
+    position = 0
+    for chunk in pd.read_csv(filename, chunksize=chunksize, dtype=np.float64):
+        values[position:position + len(chunk)] = chunk.to_numpy()
+        position += len(chunk)
+    values.flush()
+    del values
+    os.replace(temporary, cacheFilename)